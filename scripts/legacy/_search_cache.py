@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tiny TTL-bounded on-disk cache for repeated CLI search queries.
+
+Repeated identical queries during iterative work hit a dict lookup
+instead of re-running the Whoosh / sqlite search. Entries expire after
+TTL_SECONDS and the cache is capped at MAX_ENTRIES (oldest evicted
+first). Delete the file (or rebuild the index) to invalidate manually.
+"""
+
+import json
+import time
+from pathlib import Path
+
+# parents[2]: this file lives in scripts/legacy/, the shared metadata/
+# directory (relevance cache etc.) sits at the repository root.
+CACHE_PATH = Path(__file__).resolve().parents[2] / "metadata" / "search_cache.json"
+TTL_SECONDS = 120
+MAX_ENTRIES = 256
+
+
+def _load() -> dict:
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def make_key(*parts) -> str:
+    return json.dumps(parts)
+
+
+def get(key: str):
+    """Return the cached value for key, or None if absent/expired."""
+    entry = _load().get(key)
+    if entry and time.time() - entry["ts"] < TTL_SECONDS:
+        return entry["value"]
+    return None
+
+
+def put(key: str, value) -> None:
+    cache = _load()
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if now - v["ts"] < TTL_SECONDS}
+    cache[key] = {"ts": now, "value": value}
+    if len(cache) > MAX_ENTRIES:
+        oldest = sorted(cache, key=lambda k: cache[k]["ts"])
+        for k in oldest[:len(cache) - MAX_ENTRIES]:
+            del cache[k]
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache))
+        tmp.rename(CACHE_PATH)
+    except OSError:
+        pass  # caching is best-effort; never break the search itself
@@ -2,9 +2,22 @@
 """Main pipeline script using the restructured modular architecture."""
 
 import os
+import asyncio
 import json
 import argparse
+import hashlib
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List
 
 from src.pipeline.extract import extract_all_pdfs
 from src.pipeline.index import build_whoosh_index
@@ -14,12 +27,63 @@ from src.formulas.index import create_formula_index
 from src.analysis.duplicates import scan_duplicates
 from src.analysis.relevance import generate_relevance_report
 
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import PointStruct
+    QDRANT_AVAILABLE = True
+except ImportError:
+    QDRANT_AVAILABLE = False
+
+try:
+    import bm25s
+    BM25S_AVAILABLE = True
+except ImportError:
+    BM25S_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_PATH = PROJECT_ROOT / "config.json"
 
 def load_config():
     """Load configuration from config.json."""
     if CONFIG_PATH.exists():
+        if ORJSON_AVAILABLE:
+            return orjson.loads(CONFIG_PATH.read_bytes())
         with CONFIG_PATH.open() as f:
             return json.load(f)
     return {}
@@ -30,21 +94,72 @@ def ensure_dirs(cfg):
         for d in cfg["directories"].values():
             Path(d).mkdir(parents=True, exist_ok=True)
 
-def ocr_pdf(input_path: Path, output_path: Path):
-    if output_path.exists():
-        return
-    cmd = [
+def _ocr_cmd(input_path: Path, output_path: Path, cfg: dict | None) -> List[str]:
+    ocr_cfg = (cfg or {}).get("ocr", {})
+    return [
         "ocrmypdf",
-        "--optimize", "3",
+        # Plain PDF output and no optimization pass are noticeably faster
+        # than the PDF/A + "--optimize 3" defaults; both stay configurable.
+        "--optimize", str(ocr_cfg.get("optimize", 0)),
+        "--output-type", ocr_cfg.get("output_type", "pdf"),
         "--skip-text",
         "--language", "deu+eng",
+        # Let Tesseract work on pages in parallel instead of one core.
+        "--jobs", str(ocr_cfg.get("jobs", os.cpu_count() or 1)),
         str(input_path),
         str(output_path)
     ]
-    subprocess.run(cmd, check=True)
+
+def ocr_pdf(input_path: Path, output_path: Path, cfg: dict | None = None):
+    if output_path.exists():
+        return
+    subprocess.run(_ocr_cmd(input_path, output_path, cfg), check=True)
+
+async def ocr_pdf_async(input_path: Path, output_path: Path,
+                        cfg: dict | None = None):
+    """Non-blocking ocr_pdf: the subprocess runs under the event loop so
+    many documents can OCR concurrently without one thread each."""
+    if output_path.exists():
+        return
+    proc = await asyncio.create_subprocess_exec(
+        *_ocr_cmd(input_path, output_path, cfg)
+    )
+    rc = await proc.wait()
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, "ocrmypdf")
+
+# Bump when parse/chunk behavior changes so stale caches are ignored.
+PIPELINE_VERSION = 1
+
+_HASH_BLOCK = 64 * 1024
+
+def hash_file(path: Path) -> str:
+    h = blake3() if BLAKE3_AVAILABLE else hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def needs_ocr(pdf: Path, min_chars: int = 200) -> bool:
+    """Probe the first page's text layer; digital-native PDFs can skip OCR."""
+    if not PYMUPDF_AVAILABLE:
+        return True
+    try:
+        with fitz.open(pdf) as doc:
+            if doc.page_count == 0:
+                return False
+            return len(doc[0].get_text().strip()) < min_chars
+    except Exception:
+        # Unreadable via PyMuPDF: let ocrmypdf have a try.
+        return True
 
 def hash_text(text: str) -> str:
-    return hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+    # Feed the hash in 64KB slices instead of encoding the whole string up
+    # front; this keeps peak memory flat for very large chunks.
+    h = blake3() if BLAKE3_AVAILABLE else hashlib.sha256()
+    for i in range(0, len(text), _HASH_BLOCK):
+        h.update(text[i:i + _HASH_BLOCK].encode("utf-8"))
+    return h.hexdigest()[:12]
 
 def parse_pdf(path: Path) -> list:
     # blocks = partition_pdf(filename=str(path))  # uncomment real call
@@ -64,38 +179,247 @@ def extract_formulas(parsed_blocks: List[Dict]) -> List[Dict]:
     return formulas
 
 def chunk_blocks(blocks: List[Dict], max_chars=1200) -> List[Dict]:
+    # The scalar accumulator loop is fine for a few hundred blocks; for
+    # large documents the boundary search vectorizes over cumulative sums.
+    if NUMPY_AVAILABLE and len(blocks) > 1024:
+        return _chunk_blocks_np(blocks, max_chars)
+    return _chunk_blocks_py(blocks, max_chars)
+
+def _chunk_blocks_np(blocks: List[Dict], max_chars: int) -> List[Dict]:
+    """Vectorized boundary search: O(n_chunks) searchsorted calls over the
+    cumulative block lengths instead of one Python iteration per block."""
+    n = len(blocks)
+    lens = np.fromiter((len(b["text"]) for b in blocks), dtype=np.int64, count=n)
+    cum = np.cumsum(lens)
     chunks = []
-    current = []
+    i0 = 0
+    base = 0
+    while i0 < n:
+        j = int(np.searchsorted(cum, base + max_chars, side="right"))
+        if j <= i0:
+            j = i0 + 1  # single block longer than max_chars
+        group = blocks[i0:j]
+        text = "\n".join(b["text"] for b in group)
+        chunks.append({
+            "id": f"{hash_text(text)}_{len(chunks):06d}",
+            "text": text,
+            "page_span": list({b["page"] for b in group}),
+        })
+        base = int(cum[j - 1])
+        i0 = j
+    return chunks
+
+def _chunk_blocks_py(blocks: List[Dict], max_chars: int) -> List[Dict]:
+    chunks = []
+    parts: List[str] = []
+    pages = set()
     length = 0
+
+    def _flush():
+        nonlocal length
+        text = "\n".join(parts)
+        # Content hash + position instead of uuid4: deterministic across
+        # re-runs (cache friendly) and far cheaper than UUID construction.
+        chunks.append({
+            "id": f"{hash_text(text)}_{len(chunks):06d}",
+            "text": text,
+            "page_span": list(pages),
+        })
+        parts.clear()
+        pages.clear()
+        length = 0
+
     for b in blocks:
         t = b["text"]
-        if length + len(t) > max_chars and current:
-            chunks.append({"id": str(uuid.uuid4()), "text": "\n".join(x["text"] for x in current), "page_span": list({x["page"] for x in current})})
-            current = []
-            length = 0
-        current.append(b)
-        length += len(t)
-    if current:
-        chunks.append({"id": str(uuid.uuid4()), "text": "\n".join(x["text"] for x in current), "page_span": list({x["page"] for x in current})})
+        t_len = len(t)
+        if length + t_len > max_chars and parts:
+            _flush()
+        parts.append(t)
+        pages.add(b["page"])
+        length += t_len
+    if parts:
+        _flush()
+    return chunks
+
+def parse_and_chunk(parse_target: Path, cache_dir: Path | None = None) -> List[Dict]:
+    """Parse and chunk one (possibly OCRed) PDF. Runs inside a worker process.
+
+    Results are cached under the PDF's content hash, so unchanged documents
+    cost one file hash on re-runs instead of a full parse.
+    """
+    cache = None
+    if cache_dir is not None:
+        cache = cache_dir / f"{hash_file(parse_target)}.chunks.json"
+        if cache.exists():
+            try:
+                raw = cache.read_bytes()
+                payload = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                if payload.get("pipeline_version") == PIPELINE_VERSION:
+                    return payload["chunks"]
+            except (ValueError, KeyError):
+                pass
+    chunks = chunk_blocks(parse_pdf(parse_target))
+    if cache is not None:
+        payload = {"pipeline_version": PIPELINE_VERSION, "chunks": chunks}
+        tmp = cache.with_suffix(".tmp")
+        tmp.write_bytes(
+            orjson.dumps(payload) if ORJSON_AVAILABLE
+            else json.dumps(payload).encode("utf-8")
+        )
+        tmp.rename(cache)  # atomic publish
     return chunks
 
 def build_bm25_index(chunks: List[Dict], index_dir: Path):
-    # Implement Whoosh or elastic call
-    pass
+    if not chunks:
+        return
+    if not BM25S_AVAILABLE:
+        print("bm25s not installed, skipping BM25 index")
+        return
+    index_dir.mkdir(parents=True, exist_ok=True)
+    # bm25s precomputes the sparse score matrix at index time, so queries
+    # reduce to score lookups instead of pure-Python scoring as in Whoosh.
+    tokens = bm25s.tokenize([c["text"] for c in chunks], show_progress=False)
+    retriever = bm25s.BM25(k1=1.5, b=0.75)
+    retriever.index(tokens, show_progress=False)
+    # The saved layout reloads zero-copy via BM25.load(..., mmap=True).
+    retriever.save(str(index_dir))
+    # Side file mapping row numbers back to chunk ids for result joins.
+    (index_dir / "chunk_ids.json").write_text(
+        json.dumps([c["id"] for c in chunks])
+    )
+
+_EMBEDDING_MODEL = None
+_FAISS_INDEX = None
+
+def _cuda_device_count() -> int:
+    try:
+        import torch
+        return torch.cuda.device_count()
+    except ImportError:
+        return 0
+
+def _get_embedding_model(cfg):
+    """Load the embedding model once and reuse it across chunk batches."""
+    global _EMBEDDING_MODEL
+    if _EMBEDDING_MODEL is None:
+        emb_cfg = cfg.get("embeddings", {})
+        model = SentenceTransformer(
+            emb_cfg.get("model", "all-MiniLM-L6-v2"),
+            device=emb_cfg.get("device"),
+        )
+        # Embedding is memory-bandwidth-bound on GPU; halving the element
+        # size roughly doubles throughput at negligible quality cost.
+        precision = emb_cfg.get("precision", "fp32")
+        if precision == "fp16" and model.device.type == "cuda":
+            model.half()
+        elif precision == "int8":
+            print("int8 precision needs an ONNX/optimum export, using fp32")
+        _EMBEDDING_MODEL = model
+    return _EMBEDDING_MODEL
 
 def build_vector_index(chunks: List[Dict], cfg):
-    # model = SentenceTransformer(cfg["embeddings"]["model"])
-    # qdrant = QdrantClient(url=cfg["vector_store"]["url"])
-    # for c in chunks: embed = model.encode(c["text"])
-    pass
+    if not chunks:
+        return
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        print("sentence-transformers not installed, skipping vector index")
+        return
+
+    emb_cfg = cfg.get("embeddings", {})
+    model = _get_embedding_model(cfg)
+
+    # Smart batching: encode in length-sorted order so each batch carries
+    # as few pad tokens as possible, then un-permute before upload.
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]["text"]))
+    texts = [chunks[i]["text"] for i in order]
+    batch_size = emb_cfg.get("batch_size", 64)
+
+    gpu_count = _cuda_device_count()
+    if gpu_count > 1 and len(texts) >= emb_cfg.get("multi_gpu_min_chunks", 1000):
+        # Fan the encode out over every visible GPU. Worth the worker
+        # startup cost only for large batches, hence the threshold.
+        pool = model.start_multi_process_pool(
+            target_devices=[f"cuda:{i}" for i in range(gpu_count)]
+        )
+        try:
+            embeddings = model.encode_multi_process(
+                texts, pool, batch_size=batch_size, normalize_embeddings=True
+            )
+        finally:
+            model.stop_multi_process_pool(pool)
+    else:
+        embeddings = model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=True,
+        )
+    import numpy as np
+
+    vectors = np.empty_like(embeddings)
+    for pos, i in enumerate(order):
+        vectors[i] = embeddings[pos]
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    store_cfg = cfg.get("vector_store", {})
+    backend = store_cfg.get("backend", "faiss" if FAISS_AVAILABLE else "qdrant")
+
+    if backend == "faiss" and FAISS_AVAILABLE:
+        # Build locally and persist one binary file instead of paying a
+        # network round-trip per upsert; for >1M chunks switch the factory
+        # string to something like "IVF4096,PQ64" and train on a sample.
+        global _FAISS_INDEX
+        if _FAISS_INDEX is None:
+            _FAISS_INDEX = faiss.index_factory(
+                vectors.shape[1],
+                store_cfg.get("faiss_factory", "HNSW32"),
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        if not _FAISS_INDEX.is_trained:
+            _FAISS_INDEX.train(vectors)
+        _FAISS_INDEX.add(vectors)
+        index_path = Path(store_cfg.get("faiss_path", "indexes/vectors.faiss"))
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(_FAISS_INDEX, str(index_path))
+        return
+
+    if not QDRANT_AVAILABLE:
+        print("qdrant-client not installed, skipping vector upload")
+        return
+    client = QdrantClient(url=store_cfg.get("url", "http://localhost:6333"))
+    # Qdrant point IDs must be unsigned ints or UUID strings; uuid5 over
+    # the chunk id keeps them deterministic across re-runs, and the raw
+    # chunk id stays in the payload for joins with the other indexes.
+    points = [
+        PointStruct(
+            id=str(uuid.uuid5(uuid.NAMESPACE_URL, c["id"])),
+            vector=vectors[i].tolist(),
+            payload={
+                "chunk_id": c["id"],
+                "doc_id": c.get("doc_id"),
+                "page_span": c["page_span"],
+            },
+        )
+        for i, c in enumerate(chunks)
+    ]
+    collection = store_cfg.get("collection", "chunks")
+    # Upsert in large batches to amortize HTTP round-trips.
+    for start in range(0, len(points), 512):
+        client.upsert(collection_name=collection, points=points[start:start + 512])
+
+_PREVIEW_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
 
 def generate_relevance_report(chunks: List[Dict], report_path: Path):
     # Placeholder
     header = "chunk_id\tpages\tpreview\n"
-    with open(report_path, "w") as f:
+    lines = [
+        f"{c['id']}\t{c['page_span']}\t{c['text'][:80].translate(_PREVIEW_TABLE)}\n"
+        for c in chunks[:10]
+    ]
+    # One buffered writelines instead of a syscall per row.
+    with open(report_path, "w", buffering=1 << 20) as f:
         f.write(header)
-        for c in chunks[:10]:
-            f.write(f"{c['id']}\t{c['page_span']}\t{c['text'][:80].replace('\n',' ')}\n")
+        f.writelines(lines)
 
 def main():
     cfg = load_config()
@@ -109,26 +433,160 @@ def main():
 
     pdf_files = list(raw_dir.glob("*.pdf"))
     print(f"Found {len(pdf_files)} PDFs")
+    if not pdf_files:
+        print("Nothing to do.")
+        return
+
+    bm25_enabled = cfg["pipeline"]["bm25"]
+    indexes_dir = Path(cfg["directories"]["indexes"])
+
+    # OCR is CPU-bound per page and independent across documents. Keep the
+    # total worker count at about one per logical core: OCR workers times
+    # ocrmypdf's internal jobs ~ cpu_count.
+    jobs_per_ocr = max(1, cfg.get("ocr", {}).get("jobs", os.cpu_count() or 1))
+    max_workers = max(1, (os.cpu_count() or 1) // jobs_per_ocr)
+
+    ocr_enabled = cfg["pipeline"]["ocr"]
+    vector_enabled = cfg["pipeline"]["vector"]
+
+    # With tmpfs_ocr set, intermediate OCR output lives in /dev/shm so the
+    # parse stage never round-trips through disk; finished files are copied
+    # back to the persistent dir by a background thread.
+    persist_ocr_dir = ocr_dir
+    copier = None
+    if ocr_enabled and cfg["pipeline"].get("tmpfs_ocr") and Path("/dev/shm").is_dir():
+        ocr_dir = Path(tempfile.mkdtemp(prefix="ocr_", dir="/dev/shm"))
+        copier = ThreadPoolExecutor(max_workers=1)
+
+    # Three overlapped stages (OCR -> parse/chunk -> embed) connected by
+    # bounded queues so no stage runs arbitrarily far ahead of its consumer.
+    ocr_q = queue.Queue(maxsize=2 * max_workers)
+    chunk_q = queue.Queue(maxsize=2 * max_workers)
+
+    ocr_min_chars = cfg.get("ocr", {}).get("min_chars", 200)
+    ocr_concurrency = cfg.get("ocr", {}).get("concurrency", max_workers)
+
+    async def _ocr_stage_async():
+        # A semaphore caps concurrent ocrmypdf subprocesses; finished
+        # documents are forwarded as they complete, not in submit order,
+        # so parsing starts on early finishers immediately.
+        sem = asyncio.Semaphore(ocr_concurrency)
+
+        async def _one(pdf: Path):
+            # Digital-native PDFs already carry a text layer; parsing the
+            # original directly saves the whole rasterize/OCR pass.
+            if not needs_ocr(pdf, ocr_min_chars):
+                await asyncio.to_thread(ocr_q.put, (pdf, pdf))
+                return
+            ocr_out = ocr_dir / pdf.name
+            async with sem:
+                await ocr_pdf_async(pdf, ocr_out, cfg)
+            if copier is not None:
+                copier.submit(shutil.copy2, ocr_out, persist_ocr_dir / pdf.name)
+            # to_thread keeps the bounded put from stalling the event loop.
+            await asyncio.to_thread(ocr_q.put, (pdf, ocr_out))
+
+        await asyncio.gather(*(_one(pdf) for pdf in pdf_files))
+
+    # A failing stage must still emit its sentinel (else the consumer
+    # blocks on its queue forever); the exception is stashed so main()
+    # can re-raise it after the embed loop drains.
+    stage_errors: List[BaseException] = []
+
+    def ocr_stage():
+        try:
+            if ocr_enabled:
+                asyncio.run(_ocr_stage_async())
+            else:
+                for pdf in pdf_files:
+                    ocr_q.put((pdf, pdf))
+        except Exception as e:
+            stage_errors.append(e)
+        finally:
+            ocr_q.put(None)
+
+    def parse_stage():
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                in_flight = deque()
+
+                def _drain_one():
+                    pdf, fut = in_flight.popleft()
+                    chunks = fut.result()
+                    for c in chunks:
+                        c["doc_id"] = pdf.name
+                    chunk_q.put(chunks)
+
+                while True:
+                    item = ocr_q.get()
+                    if item is None:
+                        break
+                    pdf, parse_target = item
+                    in_flight.append(
+                        (pdf, ex.submit(parse_and_chunk, parse_target, parsed_dir))
+                    )
+                    if len(in_flight) >= max_workers:
+                        _drain_one()
+                while in_flight:
+                    _drain_one()
+        except Exception as e:
+            stage_errors.append(e)
+        finally:
+            chunk_q.put(None)
+
+    threading.Thread(target=ocr_stage, daemon=True).start()
+    threading.Thread(target=parse_stage, daemon=True).start()
+
+    # Embedding stage (main thread): flush a batch once it reaches
+    # embed_batch_size chunks or max_wait_seconds elapses, whichever
+    # comes first, so the GPU sees full batches without long stalls.
+    emb_cfg = cfg.get("embeddings", {})
+    embed_batch_size = emb_cfg.get("embed_batch_size", 256)
+    max_wait = emb_cfg.get("max_wait_seconds", 5.0)
+
+    per_pdf = []
+    batch = []
+    done = False
+    deadline = time.monotonic() + max_wait
+    while not done:
+        try:
+            if batch:
+                chunks = chunk_q.get(timeout=max(0.0, deadline - time.monotonic()))
+            else:
+                # Nothing buffered: block until work arrives instead of
+                # spinning on a lapsed deadline, and start the flush
+                # timer from the first item of the new batch.
+                chunks = chunk_q.get()
+                deadline = time.monotonic() + max_wait
+            if chunks is None:
+                done = True
+            else:
+                batch.extend(chunks)
+                per_pdf.append(chunks)
+        except queue.Empty:
+            pass
+        if batch and (done or len(batch) >= embed_batch_size
+                      or time.monotonic() >= deadline):
+            if vector_enabled:
+                build_vector_index(batch, cfg)
+            batch = []
+            deadline = time.monotonic() + max_wait
+
+    if copier is not None:
+        copier.shutdown(wait=True)
+        shutil.rmtree(ocr_dir, ignore_errors=True)
+
+    # Abort loudly on a stage failure instead of building indexes from
+    # whatever partial chunk stream made it through before the crash.
+    if stage_errors:
+        raise stage_errors[0]
 
-    all_chunks = []
-    for pdf in pdf_files:
-        ocr_out = ocr_dir / pdf.name
-        if cfg["pipeline"]["ocr"]:
-            ocr_pdf(pdf, ocr_out)
-            parse_target = ocr_out
-        else:
-            parse_target = pdf
-        blocks = parse_pdf(parse_target)
-        chunks = chunk_blocks(blocks)
-        for c in chunks:
-            c["doc_id"] = pdf.name
-        all_chunks.extend(chunks)
+    # One flat list built in a single pass instead of repeated extends.
+    all_chunks = list(chain.from_iterable(per_pdf))
 
     # Index
-    if cfg["pipeline"]["bm25"]:
-        build_bm25_index(all_chunks, Path(cfg["directories"]["indexes"]) / "bm25")
-    if cfg["pipeline"]["vector"]:
-        build_vector_index(all_chunks, cfg)
+    if bm25_enabled:
+        build_bm25_index(all_chunks, indexes_dir / "bm25")
 
     # Report
     generate_relevance_report(all_chunks, report_dir / "relevance_report.tsv")
@@ -3,23 +3,31 @@
 
 import argparse
 import sys
-import os
-from pathlib import Path
 
-# Add src to path for imports  
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _add_src_to_path():
+    """Make src/ importable; deferred so --help never pays for it."""
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
 
 def search_text(query, k=8):
     """Perform text search using Whoosh."""
     try:
-        import pipeline.search as psearch
+        _add_src_to_path()
+        import _search_cache
         print(f"🔍 Searching for: '{query}'")
-        results = psearch.search_whoosh(query, k)
-        
+        cache_key = _search_cache.make_key('text', query, k)
+        results = _search_cache.get(cache_key)
+        if results is None:
+            import pipeline.search as psearch
+            results = psearch.search_whoosh(query, k)
+            _search_cache.put(cache_key, results)
+
         if not results:
             print("No results found.")
             return
-            
+
         print(f"Found {len(results)} results:\n")
         for i, result in enumerate(results, 1):
             print(f"[{i}] {result['filename']}")
@@ -29,11 +37,13 @@ def search_text(query, k=8):
     except Exception as e:
         print(f"Error in text search: {e}")
 
+
 def search_formulas(symbol=None, contains=None, limit=10):
     """Perform formula search."""
     try:
-        import formulas.search as fsearch
-        
+        _add_src_to_path()
+        import _search_cache
+
         if symbol:
             print(f"🔍 Searching formulas with symbol: '{symbol}'")
         elif contains:
@@ -41,13 +51,18 @@ def search_formulas(symbol=None, contains=None, limit=10):
         else:
             print("Error: Specify either --symbol or --contains")
             return
-            
-        results = fsearch.search_formulas(symbol, contains, limit)
-        
+
+        cache_key = _search_cache.make_key('formula', symbol, contains, limit)
+        results = _search_cache.get(cache_key)
+        if results is None:
+            import formulas.search as fsearch
+            results = fsearch.search_formulas(symbol, contains, limit)
+            _search_cache.put(cache_key, results)
+
         if not results:
             print("No formula results found.")
             return
-            
+
         print(f"Found {len(results)} formula results:\n")
         for i, result in enumerate(results, 1):
             latex_preview = result['latex'][:120]
@@ -59,24 +74,37 @@ def search_formulas(symbol=None, contains=None, limit=10):
     except Exception as e:
         print(f"Error in formula search: {e}")
 
-def main():
-    """Main CLI entry point."""
+
+def _build_parser(command=None):
+    """Build the CLI parser, constructing only the requested subparser.
+
+    With command=None the full tree is built (help / error cases).
+    """
     parser = argparse.ArgumentParser(description="Search in documents and formulas")
     subparsers = parser.add_subparsers(dest='command', help='Search commands')
-    
-    # Text search
-    text_parser = subparsers.add_parser('text', help='Full-text search')
-    text_parser.add_argument('--q', required=True, help='Search query')
-    text_parser.add_argument('--k', type=int, default=8, help='Number of results')
-    
-    # Formula search  
-    formula_parser = subparsers.add_parser('formula', help='Formula search')
-    formula_parser.add_argument('--symbol', help='Symbol/token to search for')
-    formula_parser.add_argument('--contains', help='Regex pattern for LaTeX content')
-    formula_parser.add_argument('--limit', type=int, default=10, help='Number of results')
-    
+
+    if command in (None, 'text'):
+        text_parser = subparsers.add_parser('text', help='Full-text search')
+        text_parser.add_argument('--q', required=True, help='Search query')
+        text_parser.add_argument('--k', type=int, default=8, help='Number of results')
+
+    if command in (None, 'formula'):
+        formula_parser = subparsers.add_parser('formula', help='Formula search')
+        formula_parser.add_argument('--symbol', help='Symbol/token to search for')
+        formula_parser.add_argument('--contains', help='Regex pattern for LaTeX content')
+        formula_parser.add_argument('--limit', type=int, default=10, help='Number of results')
+
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command not in ('text', 'formula'):
+        command = None
+    parser = _build_parser(command)
     args = parser.parse_args()
-    
+
     if args.command == 'text':
         search_text(args.q, args.k)
     elif args.command == 'formula':
@@ -84,5 +112,6 @@ def main():
     else:
         parser.print_help()
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
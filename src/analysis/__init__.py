@@ -1,13 +1,32 @@
-"""Analysis modules for duplicate detection and relevance scoring."""
-
-from .duplicates import scan_duplicates, find_duplicate_hashes, find_similar_names
-from .relevance import generate_relevance_report, analyze_relevance, count_keywords
-
-__all__ = [
-    'scan_duplicates',
-    'find_duplicate_hashes',
-    'find_similar_names',
-    'generate_relevance_report',
-    'analyze_relevance',
-    'count_keywords'
-]
\ No newline at end of file
+"""Analysis modules for duplicate detection and relevance scoring.
+
+Exports are resolved lazily (PEP 562) so that importing the package does
+not pull in rapidfuzz/numpy until a consumer actually touches the
+duplicate or relevance helpers.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    'scan_duplicates': 'duplicates',
+    'find_duplicate_hashes': 'duplicates',
+    'find_similar_names': 'duplicates',
+    'generate_relevance_report': 'relevance',
+    'analyze_relevance': 'relevance',
+    'count_keywords': 'relevance',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,10 +2,23 @@
 """Duplicate detection module."""
 
 import hashlib
+import json
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
 from rapidfuzz import fuzz, process
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 RAW_DIRS_ENV = os.getenv("RAW_DIRS")
 if RAW_DIRS_ENV:
     RAW_DIRS = [Path(p).expanduser() for p in RAW_DIRS_ENV.split(os.pathsep) if p.strip()]
@@ -14,34 +27,118 @@ else:
 
 THRESH = int(os.getenv("DUPLICATE_NAME_THRESHOLD", "90"))
 
+# Opt-in persistent hash cache: re-runs over a mostly-static library then
+# cost one stat per file instead of read+hash.
+HASH_CACHE_ENABLED = os.getenv("DUPLICATE_HASH_CACHE") == "1"
+HASH_CACHE_PATH = Path("metadata") / "hash_cache.json"
+
+
+def _load_cache() -> dict:
+    if not HASH_CACHE_ENABLED:
+        return {}
+    try:
+        with HASH_CACHE_PATH.open() as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
 
-def file_hash(path: Path, max_bytes: int = 200_000) -> str | None:
+def _save_cache(cache: dict) -> None:
+    if not HASH_CACHE_ENABLED or not cache:
+        return
+    HASH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = HASH_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache))
+    tmp.rename(HASH_CACHE_PATH)
+
+
+def file_hash(path: Path, max_bytes: int = 200_000,
+              cache: dict | None = None) -> str | None:
     """
-    Generate SHA256 hash from first portion of file for duplicate detection.
-    
+    Generate content hash from first portion of file for duplicate detection.
+
     Args:
         path: Path to the file to hash
         max_bytes: Maximum bytes to read from file start (default: 200KB)
-        
+
     Returns:
         Hexadecimal hash string, or None if file cannot be read
-        
+
     Note:
         Only reads first 200KB for performance - sufficient for duplicate detection
         of PDFs which typically have identical headers if they're the same file.
+        This is a fingerprint, not a cryptographic commitment, so the fastest
+        available hash wins: BLAKE3 (SIMD) when installed, else BLAKE2b.
+        When a cache dict is supplied, entries keyed by path are reused as
+        long as (st_mtime_ns, st_size) still match.
     """
-    h = hashlib.sha256()
+    key = entry = None
+    if cache is not None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        entry = cache.get(key)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+
+    h = blake3.blake3() if BLAKE3_AVAILABLE else hashlib.blake2b(digest_size=16)
     try:
+        # 64KB blocks keep the active buffer L1/L2 resident, which is what
+        # the SIMD hash kernels are tuned for, and cap peak memory even if
+        # max_bytes grows.
+        remaining = max_bytes
         with path.open("rb") as f:
-            chunk = f.read(max_bytes)
-            h.update(chunk)
-        return h.hexdigest()
+            while remaining > 0:
+                chunk = f.read(min(65536, remaining))
+                if not chunk:
+                    break
+                h.update(chunk)
+                remaining -= len(chunk)
     except OSError:
         return None
+    digest = h.hexdigest()
+    if cache is not None:
+        cache[key] = [st.st_mtime_ns, st.st_size, digest]
+    return digest
+
+
+def _walk(base: str) -> Iterator[Path]:
+    """Recursive os.scandir walk yielding PDF paths.
+
+    DirEntry carries the file-type info from the directory read itself, so
+    is_file() costs no extra stat, unlike rglob + Path.is_file().
+    """
+    try:
+        entries = os.scandir(base)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk(entry.path)
+                elif (entry.name.lower().endswith(".pdf")
+                      and entry.is_file(follow_symlinks=False)):
+                    yield Path(entry.path)
+            except OSError:
+                continue
 
 
-def iter_pdfs() -> list[Path]:
-    """Get all PDF files from raw directories."""
+def iter_pdfs() -> Iterator[Path]:
+    """Yield PDF files from raw directories as the walk discovers them.
+
+    Lazy on purpose: hashing can start while the directory tree is still
+    being scanned. No sorting here; sort at the consumer where ordering
+    matters for stable output.
+    """
+    for base in RAW_DIRS:
+        yield from _walk(str(base))
+
+
+def list_pdfs() -> list[Path]:
+    """Get all PDF files from raw directories, sorted per directory."""
     pdfs: list[Path] = []
     for base in RAW_DIRS:
         if not base.exists():
@@ -50,32 +147,89 @@ def iter_pdfs() -> list[Path]:
     return pdfs
 
 
-def find_duplicate_hashes(files: list[Path]) -> dict[str, list[str]]:
-    """Find files with identical content hashes."""
-    hashes: dict[str | None, list[str]] = {}
+def find_duplicate_hashes(files: Iterable[Path]) -> dict[str, list[str]]:
+    """Find files with identical content hashes.
+
+    A file whose size is unique cannot have a content duplicate, so files
+    are grouped by st_size first (one stat each) and only size collisions
+    get hashed. The remaining hashing is pure I/O and is overlapped via a
+    thread pool; the speedup scales with how many outstanding reads the
+    storage device can serve.
+    """
+    by_size: defaultdict[int, list[Path]] = defaultdict(list)
     for p in files:
-        h = file_hash(p)
-        hashes.setdefault(h, []).append(p.name)
-    
-    return {k: v for k, v in hashes.items() if k and len(v) > 1}
+        try:
+            by_size[p.stat().st_size].append(p)
+        except OSError:
+            continue
+    candidates = [p for group in by_size.values() if len(group) > 1 for p in group]
+
+    cache = _load_cache() if HASH_CACHE_ENABLED else None
+    hasher = partial(file_hash, cache=cache)
+
+    # defaultdict probes the table once per file; setdefault did twice.
+    hashes: defaultdict[str, list[str]] = defaultdict(list)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for p, h in zip(candidates, ex.map(hasher, candidates)):
+            if h is not None:
+                hashes[h].append(p.name)
+
+    if cache is not None:
+        _save_cache(cache)
+    return {k: v for k, v in hashes.items() if len(v) > 1}
 
 
 def find_similar_names(names: list[str], threshold: int = THRESH) -> list[tuple[int, str, str]]:
     """Find files with similar names (potential duplicates/typos)."""
+    if len(names) < 2:
+        return []
+    # Sorted here (not in iter_pdfs) so the pair output stays stable
+    # regardless of directory walk order.
+    names = sorted(names)
+
+    # Token-sort each name once up front; plain fuzz.ratio over the
+    # normalized strings gives the same score as token_sort_ratio without
+    # re-tokenizing and re-sorting inside every comparison, and the plain
+    # Levenshtein kernel is what rapidfuzz optimizes best.
+    normed = [" ".join(sorted(n.lower().split())) for n in names]
+
+    # High scores require lengths within a few percent of each other, so
+    # block by normalized length and compare each bucket only against
+    # itself and its right neighbor (standard blocked record linkage):
+    # roughly O(n*k) work instead of the full n^2 matrix.
+    buckets: dict[int, list[int]] = {}
+    for idx, s in enumerate(normed):
+        buckets.setdefault(len(s) // 4, []).append(idx)
+
     similar_pairs = []
-    reported: set[tuple[str, str]] = set()
-    
-    for name in names:
-        matches = process.extract(name, names, scorer=fuzz.token_sort_ratio, limit=5)
-        for cand, score, _ in matches:
-            if cand == name or score < threshold:
+    seen: set[tuple[str, str]] = set()
+    for key in sorted(buckets):
+        rows = buckets[key]
+        cols = rows + buckets.get(key + 1, [])
+        if len(cols) < 2:
+            continue
+        # cdist runs the bucket-pair matrix in C with OpenMP threads
+        # instead of dispatching each comparison through Python.
+        scores = process.cdist(
+            [normed[i] for i in rows],
+            [normed[i] for i in cols],
+            scorer=fuzz.ratio,
+            score_cutoff=threshold,
+            workers=-1,
+            dtype=np.uint8,
+        )
+        i, j = np.nonzero(scores >= threshold)
+        for a, b in zip(i.tolist(), j.tolist()):
+            ia, ib = rows[a], cols[b]
+            if ia == ib:
                 continue
-            pair = tuple(sorted([name, cand]))
-            if pair in reported:
+            pair = tuple(sorted((names[ia], names[ib])))
+            if pair in seen:
                 continue
-            reported.add(pair)
-            similar_pairs.append((score, pair[0], pair[1]))
-    
+            seen.add(pair)
+            similar_pairs.append((int(scores[a, b]), pair[0], pair[1]))
+
     return sorted(similar_pairs, key=lambda x: x[0], reverse=True)
 
 
@@ -98,16 +252,23 @@ def scan_duplicates():
         >>> print(f"Found {len(result['duplicate_hashes'])} hash duplicate groups")
         >>> print(f"Found {len(result['similar_names'])} similar name pairs")
     """
-    files = iter_pdfs()
-    if not files:
+    # Stream the directory walk straight into the size/hash pass, tapping
+    # off the names on the way; nothing waits for the full listing.
+    names: list[str] = []
+
+    def _tap(paths: Iterable[Path]) -> Iterator[Path]:
+        for p in paths:
+            names.append(p.name)
+            yield p
+
+    dup_hash = find_duplicate_hashes(_tap(iter_pdfs()))
+    if not names:
         print("Keine PDFs gefunden. Setze RAW_DIRS oder lege Dateien unter 'raw/' ab.")
         return
-    
-    names = [p.name for p in files]
-    print(f"Gefundene PDFs: {len(files)}")
+
+    print(f"Gefundene PDFs: {len(names)}")
 
     # Check for identical hashes
-    dup_hash = find_duplicate_hashes(files)
     if dup_hash:
         print("\n[Identische Inhalte (gleicher Hash)]")
         for h, group in dup_hash.items():
@@ -122,7 +283,7 @@ def scan_duplicates():
     print(f"\nHinweis: Prüfe Paare >= {THRESH}%. Entferne Tippfehler-Versionen oder vereinheitliche Schreibweise.")
     
     return {
-        'total_files': len(files),
+        'total_files': len(names),
         'duplicate_hashes': dup_hash,
         'similar_names': similar_pairs
     }
\ No newline at end of file
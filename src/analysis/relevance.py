@@ -2,39 +2,174 @@
 """Relevance analysis module based on keyword counts."""
 
 import argparse
+import hashlib
+import json
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 import csv
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 TXT_DIR = Path("txt")
 META_DIR = Path("metadata")
 META_DIR.mkdir(exist_ok=True, parents=True)
 
+RELEVANCE_CACHE_PATH = META_DIR / "relevance_cache.json"
+
+
+def _load_relevance_cache() -> dict:
+    try:
+        return json.loads(RELEVANCE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_relevance_cache(cache: dict) -> None:
+    try:
+        tmp = RELEVANCE_CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache))
+        tmp.rename(RELEVANCE_CACHE_PATH)
+    except OSError:
+        pass  # best-effort; never fail the report over the cache
+
+
+# ASCII-only lowercase table; matching is byte-based, so keywords are
+# compared case-insensitively for ASCII letters and verbatim otherwise.
+_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+@lru_cache(maxsize=1024)
+def _lowered_key(kw: str) -> bytes:
+    # Cached: the same keyword set is lowered once per process, not once
+    # per (keyword, file) pair in the fallback counting path.
+    return kw.encode("utf-8").translate(_LOWER_TABLE)
+
+
+def _read_lowered(path: Path) -> bytes:
+    """Memory-map a text file and lowercase it in one C-level translate.
+
+    Skips the UTF-8 decode into a Python str entirely: counting works on
+    the raw lowered bytes.
+    """
+    with open(path, "rb") as fp:
+        try:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:].translate(_LOWER_TABLE)
+        except ValueError:  # empty files cannot be mapped
+            return fp.read().translate(_LOWER_TABLE)
+
+
+def _build_automaton(keywords: list[str]):
+    """Build an Aho-Corasick automaton mapping lowered keywords back to
+    their original spelling.
+
+    Keys are the lowered UTF-8 bytes viewed as latin-1, matching exactly
+    how _count_lowered presents the haystack to the automaton.
+    """
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(_lowered_key(kw).decode("latin-1"), kw)
+    automaton.make_automaton()
+    return automaton
+
 
-def count_keywords(text: str, keywords: list[str]) -> dict[str, int]:
-    """Count occurrences of keywords in text (case-insensitive)."""
-    counts = {}
-    low = text.lower()
+def _count_lowered(low: bytes, keywords: list[str], automaton=None) -> dict[str, int]:
+    counts = {kw: 0 for kw in keywords}
+    if automaton is not None:
+        # The automaton reports overlapping occurrences, bytes.count
+        # counts non-overlapping ones ("aa" in "aaa": twice vs once).
+        # Skip matches starting before the previous accepted match of
+        # the same keyword ended so both paths agree exactly.
+        lengths = {kw: len(_lowered_key(kw)) for kw in keywords}
+        next_start = {kw: 0 for kw in keywords}
+        # latin-1 is a 1:1 byte->str view, so this is a plain widening
+        # copy with no decode validation work.
+        for end, kw in automaton.iter(low.decode("latin-1")):
+            if end - lengths[kw] + 1 >= next_start[kw]:
+                counts[kw] += 1
+                next_start[kw] = end + 1
+        return counts
     for kw in keywords:
-        c = low.count(kw.lower())
-        counts[kw] = c
+        counts[kw] = low.count(_lowered_key(kw))
     return counts
 
 
+def count_keywords(text: str, keywords: list[str], automaton=None) -> dict[str, int]:
+    """Count occurrences of keywords in text (ASCII case-insensitive).
+
+    With an automaton all keywords are counted in a single scan over the
+    text; otherwise each keyword costs one count pass over the bytes.
+    """
+    return _count_lowered(
+        text.encode("utf-8", errors="ignore").translate(_LOWER_TABLE),
+        keywords,
+        automaton,
+    )
+
+
+# Per-process automaton cache so pool workers build it once, not per file.
+_WORKER_KEYWORDS: list[str] | None = None
+_WORKER_AUTOMATON = None
+
+
+def _analyze_one(f: Path, keywords: list[str]) -> dict:
+    """Count keywords in one file and build its report row."""
+    global _WORKER_KEYWORDS, _WORKER_AUTOMATON
+    if keywords != _WORKER_KEYWORDS:
+        _WORKER_KEYWORDS = list(keywords)
+        _WORKER_AUTOMATON = _build_automaton(keywords) if AHOCORASICK_AVAILABLE else None
+    counts = _count_lowered(_read_lowered(f), keywords, _WORKER_AUTOMATON)
+    return {
+        "doc": f.name,
+        "total_hits": sum(counts.values()),
+        **counts
+    }
+
+
 def analyze_relevance(keywords: list[str]) -> list[dict]:
-    """Analyze relevance of all text files based on keyword counts."""
-    rows = []
+    """Analyze relevance of all text files based on keyword counts.
+
+    Files are independent read+count work, so larger corpora fan out over
+    a process pool; small ones stay serial to skip the pool startup cost.
+    Rows are cached in metadata/relevance_cache.json keyed by (path,
+    mtime, keyword set), so unchanged files cost one stat on re-runs.
+    """
     txt_files = list(TXT_DIR.glob("*.txt"))
-    
+    kw_hash = hashlib.sha1(",".join(keywords).encode("utf-8")).hexdigest()
+    cache = _load_relevance_cache()
+
+    rows = []
+    pending: list[tuple[Path, str]] = []
     for f in txt_files:
-        text = f.read_text(encoding="utf-8", errors="ignore")
-        counts = count_keywords(text, keywords)
-        total_hits = sum(counts.values())
-        rows.append({
-            "doc": f.name,
-            "total_hits": total_hits,
-            **counts
-        })
-    
+        try:
+            key = f"{f}|{f.stat().st_mtime_ns}|{kw_hash}"
+        except OSError:
+            continue
+        row = cache.get(key)
+        if row is not None:
+            rows.append(row)
+        else:
+            pending.append((f, key))
+
+    worker = partial(_analyze_one, keywords=keywords)
+    if len(pending) >= 16:
+        with ProcessPoolExecutor() as ex:
+            new_rows = list(ex.map(worker, [f for f, _ in pending], chunksize=8))
+    else:
+        new_rows = [worker(f) for f, _ in pending]
+
+    for (_, key), row in zip(pending, new_rows):
+        cache[key] = row
+        rows.append(row)
+    if new_rows:
+        _save_relevance_cache(cache)
+
     # Sort by total_hits desc
     rows.sort(key=lambda r: r["total_hits"], reverse=True)
     return rows
@@ -45,10 +180,13 @@ def save_relevance_report(rows: list[dict], keywords: list[str]) -> Path:
     out_file = META_DIR / "relevance_report.csv"
     with out_file.open("w", newline="", encoding="utf-8") as csvfile:
         fieldnames = ["doc", "total_hits"] + keywords
-        w = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w = csv.writer(csvfile)
+        w.writerow(fieldnames)
+        # Plain tuples skip DictWriter's per-cell dict lookup machinery.
+        w.writerows(
+            (r["doc"], r["total_hits"], *(r[k] for k in keywords))
+            for r in rows
+        )
     return out_file
 
 
@@ -1,55 +1,71 @@
 #!/usr/bin/env python3
 """CLI for analysis tools."""
 
-import argparse
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from analysis.duplicates import scan_duplicates
-from analysis.relevance import generate_relevance_report
+# analysis submodules import inside the command handlers: duplicates
+# pulls rapidfuzz/numpy, relevance the automaton machinery — each
+# subcommand should only pay for its own chain.
+
+# Two trivial subcommands with one option each: a hand-rolled argv scan
+# dodges the argparse import/construction cost on every invocation.
+_HELP = """usage: analyze.py [-h] {duplicates,relevance} ...
+
+Analysis tools for PDF collection
+
+commands:
+  duplicates            Scan for duplicate files
+    --threshold N       Similarity threshold for name matching (default: 90)
+  relevance             Generate relevance report
+    --keywords K1,K2    Comma-separated keywords to search for
+"""
+
+_DEFAULT_KEYWORDS = "reconstruction,super-resolution,gappy,POD,uncertainty"
+
+
+def _option(name: str, default: str) -> str:
+    """Return the value following --name in argv, or default."""
+    try:
+        return sys.argv[sys.argv.index(name) + 1]
+    except (ValueError, IndexError):
+        return default
+
+
+def _run_duplicates() -> None:
+    from analysis.duplicates import scan_duplicates
+
+    result = scan_duplicates()
+    if result:
+        print("\nSummary:")
+        print(f"- Total files: {result['total_files']}")
+        print(f"- Duplicate hash groups: {len(result['duplicate_hashes'])}")
+        print(f"- Similar name pairs: {len(result['similar_names'])}")
+
+
+def _run_relevance() -> None:
+    from analysis.relevance import generate_relevance_report
+
+    keywords = _option("--keywords", _DEFAULT_KEYWORDS)
+    rows, out_file = generate_relevance_report(keywords)
+    print(f"\nGenerated relevance report with {len(rows)} documents.")
+
+
+def _print_help() -> None:
+    print(_HELP, end="")
 
 
 def main():
     """Main CLI entry point for analysis tools."""
-    parser = argparse.ArgumentParser(description="Analysis tools for PDF collection")
-    subparsers = parser.add_subparsers(dest='command', help='Analysis commands')
-    
-    # Duplicate detection
-    dup_parser = subparsers.add_parser('duplicates', help='Scan for duplicate files')
-    dup_parser.add_argument(
-        '--threshold', 
-        type=int, 
-        default=90, 
-        help='Similarity threshold for name matching (default: 90)'
-    )
-    
-    # Relevance analysis
-    rel_parser = subparsers.add_parser('relevance', help='Generate relevance report')
-    rel_parser.add_argument(
-        '--keywords', 
-        type=str, 
-        default="reconstruction,super-resolution,gappy,POD,uncertainty",
-        help='Comma-separated keywords to search for'
-    )
-    
-    args = parser.parse_args()
-    
-    if args.command == 'duplicates':
-        result = scan_duplicates()
-        if result:
-            print(f"\nSummary:")
-            print(f"- Total files: {result['total_files']}")
-            print(f"- Duplicate hash groups: {len(result['duplicate_hashes'])}")
-            print(f"- Similar name pairs: {len(result['similar_names'])}")
-    
-    elif args.command == 'relevance':
-        rows, out_file = generate_relevance_report(args.keywords)
-        print(f"\nGenerated relevance report with {len(rows)} documents.")
-        
-    else:
-        parser.print_help()
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in ("-h", "--help"):
+        command = None
+    {
+        "duplicates": _run_duplicates,
+        "relevance": _run_relevance,
+    }.get(command, _print_help)()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
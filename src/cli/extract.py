@@ -1,26 +1,33 @@
 #!/usr/bin/env python3
 """CLI for text extraction from PDFs."""
 
-import argparse
+import sys
+
 from src.pipeline.extract import extract_all_pdfs
 
+# argparse (and its gettext/textwrap chain) is overkill for one flag; a
+# plain argv scan keeps startup at interpreter cost.
+_HELP = """usage: extract.py [-h] [-v]
+
+Extract text from PDFs
+
+options:
+  -h, --help     show this help message and exit
+  -v, --verbose  Verbose output
+"""
+
 
 def main():
     """Main CLI entry point for text extraction."""
-    parser = argparse.ArgumentParser(description="Extract text from PDFs")
-    parser.add_argument(
-        "--verbose", "-v", 
-        action="store_true", 
-        help="Verbose output"
-    )
-    
-    args = parser.parse_args()
-    
-    if args.verbose:
+    if "-h" in sys.argv or "--help" in sys.argv:
+        print(_HELP, end="")
+        return
+
+    if "-v" in sys.argv or "--verbose" in sys.argv:
         print("Starting PDF text extraction...")
-    
+
     extract_all_pdfs()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
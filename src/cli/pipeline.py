@@ -2,73 +2,69 @@
 """CLI for pipeline management."""
 
 import argparse
+import sys
 from typing import Dict
 
-from src.pipeline.extract import extract_all_pdfs
-from src.pipeline.index import build_whoosh_index
-from src.pipeline.logging_utils import setup_pipeline_logging
-from src.formulas.extract import extract_all_formulas
-from src.formulas.index import create_formula_index
-from src.formulas.nougat import process_nougat_batch
+# Pipeline/formula modules are imported inside the command branches: they
+# transitively pull in PyMuPDF, Whoosh and the Nougat stack, which would
+# make `--help` pay seconds of import time for code it never runs.
 
 
 def _print_summary(title: str, result: Dict[str, object]) -> None:
-    print(f"\n{title}")
-    print("-" * len(title))
+    # The whole summary is collected and flushed with one write: with
+    # line-buffered stdout, a long error list would otherwise cost one
+    # syscall per entry.
+    lines = [f"\n{title}", "-" * len(title)]
     processed = result.get("processed", result.get("indexed", 0))
-    print(f"Verarbeitet: {processed}/{result.get('total', 0)}")
+    lines.append(f"Verarbeitet: {processed}/{result.get('total', 0)}")
 
     skipped = result.get("skipped")
     if skipped:
-        print(f"Übersprungen: {skipped}")
+        lines.append(f"Übersprungen: {skipped}")
 
     metadata_errors = result.get("metadata_errors")
     if metadata_errors:
-        print(f"Metadaten-Warnungen: {metadata_errors}")
+        lines.append(f"Metadaten-Warnungen: {metadata_errors}")
 
     errors = result.get("errors")
     if errors:
-        print("Fehler:")
+        lines.append("Fehler:")
         if isinstance(errors, list):
             for entry in errors:
                 if isinstance(entry, dict):
                     origin = entry.get("pdf") or entry.get("file") or "unbekannt"
-                    print(f"  - {origin}: {entry.get('error')}")
+                    lines.append(f"  - {origin}: {entry.get('error')}")
                 else:
-                    print(f"  - {entry}")
+                    lines.append(f"  - {entry}")
         else:
-            print(f"  - {errors}")
+            lines.append(f"  - {errors}")
 
     if "total_formulas" in result:
-        print(f"Formeln: {result.get('total_formulas')}")
+        lines.append(f"Formeln: {result.get('total_formulas')}")
         with_formulas = result.get("documents_with_formulas")
         without_formulas = result.get("documents_without_formulas")
         if with_formulas is not None or without_formulas is not None:
-            print(
+            lines.append(
                 "Dokumente mit/ohne Formeln: "
                 f"{with_formulas or 0}/{without_formulas or 0}"
             )
         output_file = result.get("output_file")
         if output_file:
-            print(f"Metadaten: {output_file}")
+            lines.append(f"Metadaten: {output_file}")
         text_dir = result.get("text_dir")
         if text_dir:
-            print(f"Texte ohne LaTeX: {text_dir}")
+            lines.append(f"Texte ohne LaTeX: {text_dir}")
 
     if "token_mappings" in result:
-        print(f"Token-Zuordnungen: {result.get('token_mappings')}")
+        lines.append(f"Token-Zuordnungen: {result.get('token_mappings')}")
         db_path = result.get("db_path")
         if db_path:
-            print(f"Index: {db_path}")
+            lines.append(f"Index: {db_path}")
 
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def main() -> None:
-    """Main CLI entry point for pipeline management."""
-
-    parser = argparse.ArgumentParser(description="PDF knowledge pipeline management")
-    subparsers = parser.add_subparsers(dest="command", help="Pipeline commands")
 
-    # Full pipeline
+def _add_full(subparsers) -> None:
     full_parser = subparsers.add_parser("full", help="Run complete pipeline")
     full_parser.add_argument("--skip-nougat", action="store_true", help="Skip Nougat OCR processing")
     full_parser.add_argument("--batch-size", type=int, default=None, help="Number of PDFs per batch")
@@ -78,28 +74,77 @@ def main() -> None:
     full_parser.add_argument("--overwrite", action="store_true", help="Reprocess existing outputs")
     full_parser.add_argument("--no-progress", action="store_true", help="Disable progress bars")
 
-    # Individual steps
+
+def _add_extract(subparsers) -> None:
     extract_parser = subparsers.add_parser("extract", help="Extract text from PDFs")
     extract_parser.add_argument("--batch-size", type=int, default=None, help="Number of PDFs per batch")
     extract_parser.add_argument("--overwrite", action="store_true", help="Reprocess existing outputs")
     extract_parser.add_argument("--no-progress", action="store_true", help="Disable progress bars")
 
+
+def _add_index(subparsers) -> None:
     index_parser = subparsers.add_parser("index", help="Build Whoosh search index")
     index_parser.add_argument("--batch-size", type=int, default=None, help="Number of text files per batch")
     index_parser.add_argument("--no-progress", action="store_true", help="Disable progress bars")
 
+
+def _add_nougat(subparsers) -> None:
     subparsers.add_parser("nougat", help="Run Nougat OCR on PDFs")
+
+
+def _add_formulas(subparsers) -> None:
     subparsers.add_parser("formulas", help="Extract formulas from Nougat output")
+
+
+def _add_formula_index(subparsers) -> None:
     subparsers.add_parser("formula-index", help="Build formula search index")
 
+
+_SUBCOMMANDS = {
+    "full": _add_full,
+    "extract": _add_extract,
+    "index": _add_index,
+    "nougat": _add_nougat,
+    "formulas": _add_formulas,
+    "formula-index": _add_formula_index,
+}
+
+
+def _build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser, constructing only the requested subparser.
+
+    With command=None every subparser is built (needed so --help can list
+    the commands); a known command builds just its own block.
+    """
+    parser = argparse.ArgumentParser(description="PDF knowledge pipeline management")
+    subparsers = parser.add_subparsers(dest="command", help="Pipeline commands")
+    for name, add in _SUBCOMMANDS.items():
+        if command is None or name == command:
+            add(subparsers)
+    return parser
+
+
+def main() -> None:
+    """Main CLI entry point for pipeline management."""
+
+    # Sniff the subcommand so only its parser gets built; anything else
+    # (flags, typos, no args) falls back to the full tree for help/errors.
+    command = next((a for a in sys.argv[1:] if not a.startswith("-")), None)
+    if command not in _SUBCOMMANDS:
+        command = None
+    parser = _build_parser(command)
     args = parser.parse_args()
 
+    from src.pipeline.logging_utils import setup_pipeline_logging
+
     setup_pipeline_logging()
 
     if args.command == "full":
         print("Running complete pipeline...")
 
         print("\n1. Extracting text from PDFs...")
+        from src.pipeline.extract import extract_all_pdfs
+
         extract_result = extract_all_pdfs(
             batch_size=args.batch_size,
             overwrite=args.overwrite,
@@ -108,6 +153,8 @@ def main() -> None:
         _print_summary("Textextraktion", extract_result)
 
         print("\n2. Building Whoosh index...")
+        from src.pipeline.index import build_whoosh_index
+
         index_result = build_whoosh_index(
             batch_size=args.index_batch_size,
             show_progress=not args.no_progress,
@@ -115,15 +162,22 @@ def main() -> None:
         _print_summary("Whoosh-Index", index_result)
 
         if not args.skip_nougat:
+            # Imported only here so --skip-nougat never loads src.formulas.*
             print("\n3. Running Nougat OCR...")
+            from src.formulas.nougat import process_nougat_batch
+
             nougat_result = process_nougat_batch()
             print(f"Nougat completed: {nougat_result['success']}/{nougat_result['total']} successful")
 
             print("\n4. Extracting formulas...")
+            from src.formulas.extract import extract_all_formulas
+
             formula_result = extract_all_formulas(show_progress=not args.no_progress)
             _print_summary("Formel-Extraktion", formula_result)
 
             print("\n5. Building formula index...")
+            from src.formulas.index import create_formula_index
+
             formula_index = create_formula_index()
             _print_summary("Formel-Index", formula_index)
         else:
@@ -132,6 +186,8 @@ def main() -> None:
         print("\nPipeline completed!")
 
     elif args.command == "extract":
+        from src.pipeline.extract import extract_all_pdfs
+
         result = extract_all_pdfs(
             batch_size=args.batch_size,
             overwrite=args.overwrite,
@@ -140,6 +196,8 @@ def main() -> None:
         _print_summary("Textextraktion", result)
 
     elif args.command == "index":
+        from src.pipeline.index import build_whoosh_index
+
         result = build_whoosh_index(
             batch_size=args.batch_size,
             show_progress=not args.no_progress,
@@ -147,14 +205,20 @@ def main() -> None:
         _print_summary("Whoosh-Index", result)
 
     elif args.command == "nougat":
+        from src.formulas.nougat import process_nougat_batch
+
         result = process_nougat_batch()
         print(f"Nougat completed: {result['success']}/{result['total']} successful")
 
     elif args.command == "formulas":
+        from src.formulas.extract import extract_all_formulas
+
         result = extract_all_formulas(show_progress=not args.no_progress)
         _print_summary("Formel-Extraktion", result)
 
     elif args.command == "formula-index":
+        from src.formulas.index import create_formula_index
+
         result = create_formula_index()
         _print_summary("Formel-Index", result)
 
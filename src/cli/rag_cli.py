@@ -5,7 +5,12 @@
 import argparse
 import textwrap
 
-from src.rag import DEFAULT_MODEL, SimpleRAGSession
+# src.rag pulls chromadb/sentence-transformers/OpenAI; it is imported in
+# main() after argparse so --help stays cheap. The default chat model is
+# read straight from the config, which src.rag uses as well.
+from src.config import CFG
+
+DEFAULT_MODEL = CFG.get("models", {}).get("chat", "gpt-4o-mini")
 
 
 def _print_banner(model_name: str) -> None:
@@ -42,6 +47,8 @@ def main() -> None:
     parser.add_argument("--api-key", default=None, help="OpenAI API Key (überschreibt .env)")
     args = parser.parse_args()
 
+    from src.rag import SimpleRAGSession
+
     session = SimpleRAGSession(
         chat_model=args.model or DEFAULT_MODEL,
         temperature=args.temperature,
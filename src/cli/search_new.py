@@ -2,20 +2,9 @@
 """CLI for search functionality."""
 
 import argparse
-import sys
-from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
-
-# Import with absolute path to avoid conflicts
-exec("""
-from pipeline.search import search_whoosh, print_search_results
-""")
-
-# Import functions manually to avoid import conflicts
-import pipeline.search as psearch
-import formulas.search as fsearch
+# Search modules are imported inside the command branches: a text query
+# should not pay for loading the formula/sqlite machinery and vice versa.
 
 
 def main():
@@ -44,25 +33,29 @@ def main():
     args = parser.parse_args()
     
     if args.command == 'text':
-        results = psearch.search_whoosh(args.q, args.k)
-        psearch.print_search_results(results)
-        
+        from src.pipeline.search import search_whoosh, print_search_results
+        results = search_whoosh(args.q, args.k)
+        print_search_results(results)
+
     elif args.command == 'formula':
         if not args.symbol and not args.contains:
             print("Error: Specify either --symbol or --contains")
             return
-        results = fsearch.search_formulas(args.symbol, args.contains, args.limit)
-        fsearch.print_formula_results(results)
-        
+        from src.formulas.search import search_formulas, print_formula_results
+        results = search_formulas(args.symbol, args.contains, args.limit)
+        print_formula_results(results)
+
     elif args.command == 'combined':
+        from src.pipeline.search import search_whoosh, print_search_results
         print("=== TEXT SEARCH ===")
-        text_results = psearch.search_whoosh(args.q, args.k)
-        psearch.print_search_results(text_results)
-        
+        text_results = search_whoosh(args.q, args.k)
+        print_search_results(text_results)
+
         if args.symbol:
+            from src.formulas.search import search_formulas, print_formula_results
             print("\n=== FORMULA SEARCH ===")
-            formula_results = fsearch.search_formulas(symbol=args.symbol, limit=args.formula_limit)
-            fsearch.print_formula_results(formula_results)
+            formula_results = search_formulas(symbol=args.symbol, limit=args.formula_limit)
+            print_formula_results(formula_results)
     
     else:
         parser.print_help()
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-import copy
+import hashlib
 import json
 import os
+import pickle
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping, MutableMapping
 
@@ -46,6 +48,11 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "temperature": 0.0,
         "results_per_query": 5,
         "cache_size": 64,
+        "encode_batch": 64,
+        # Optional storage quantization for indexed embeddings:
+        # "" (off, float32), "fp16" or "int8" (per-vector scale kept in
+        # chunk metadata as embedding_scale).
+        "quantize": "",
         "chunking": {
             "size": 1200,
             "overlap": 200,
@@ -54,6 +61,14 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "target_chunk_count": 256,
             "min_size": 400,
         },
+        # HNSW index tuning for Chroma collections. Raise search_ef when
+        # results look thin (better recall), lower it for latency;
+        # M/construction_ef only affect newly built collections.
+        "hnsw": {
+            "M": 32,
+            "construction_ef": 200,
+            "search_ef": 128,
+        },
         "chroma_settings": {
             "chroma_db_impl": "duckdb+parquet",
             "anonymized_telemetry": False,
@@ -69,19 +84,31 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "metadata_file": "metadata/formulas.jsonl",
         "index_db": "metadata/formula_index.sqlite",
     },
+    "nougat": {
+        # Weight/compute precision for the Nougat model: "bfloat16"
+        # (default, ~2x faster and half the memory) or "float32".
+        "dtype": "bfloat16",
+    },
 }
 
-ENVIRONMENT_OVERRIDES: Mapping[tuple[str, ...], str] = {
-    ("services", "openai", "api_key"): "OPENAI_API_KEY",
-    ("services", "mathpix", "app_id"): "MATHPIX_APP_ID",
-    ("services", "mathpix", "app_key"): "MATHPIX_APP_KEY",
-    ("services", "zotero", "user_id"): "ZOTERO_USER_ID",
-    ("services", "zotero", "api_key"): "ZOTERO_API_KEY",
-}
+# Serialized once so load_config() can clone the defaults via json.loads.
+_DEFAULT_CONFIG_JSON = json.dumps(DEFAULT_CONFIG)
+
+# Part of the pickle-cache key: when DEFAULT_CONFIG changes (new sections,
+# new keys), caches written by older code no longer match and the merge
+# reruns instead of serving a config missing the additions.
+_DEFAULTS_FINGERPRINT = hashlib.sha1(_DEFAULT_CONFIG_JSON.encode("utf-8")).hexdigest()
+
 
 
 def _candidate_paths() -> Iterable[Path]:
-    """Yield candidate configuration files ordered by precedence."""
+    """Yield candidate configuration files ordered by precedence.
+
+    The first existing file wins outright: PIPELINE_CONFIG_PATH is
+    authoritative when set, then config.json at the repo root, then
+    config/config.json, config/config.local.json and finally the shipped
+    config/config.example.json.
+    """
 
     env_path = os.getenv("PIPELINE_CONFIG_PATH")
     if env_path:
@@ -94,6 +121,15 @@ def _candidate_paths() -> Iterable[Path]:
     yield root / "config" / "config.example.json"
 
 
+def _chosen_config_path() -> Path | None:
+    """Return the highest-precedence config file that exists, if any."""
+
+    for path in _candidate_paths():
+        if path.is_file():
+            return path
+    return None
+
+
 def _load_json(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
@@ -108,40 +144,88 @@ def _deep_update(base: MutableMapping[str, Any], updates: Mapping[str, Any]) ->
     return base
 
 
-def _set_nested(target: MutableMapping[str, Any], keys: Iterable[str], value: Any) -> None:
-    keys = list(keys)
-    cursor: MutableMapping[str, Any] = target
-    for key in keys[:-1]:
-        existing = cursor.get(key)
-        if not isinstance(existing, MutableMapping):
-            existing = {}
-            cursor[key] = existing
-        cursor = existing  # type: ignore[assignment]
-    cursor[keys[-1]] = value
+# Merged config cache: JSON parse + deep merge are skipped entirely when
+# none of the candidate files changed since the last run.
+_PICKLE_CACHE_PATH = Path.home() / ".cache" / "texteverarbeiten" / "config.pkl"
 
 
-def load_config() -> Dict[str, Any]:
-    """Return the merged configuration using defaults, files and environment."""
+def _apply_env_overrides(config: MutableMapping[str, Any]) -> None:
+    # The target paths all exist in DEFAULT_CONFIG, so direct indexing
+    # replaces the generic nested-walk setter this module used to carry.
+    services = config["services"]
+    if value := os.getenv("OPENAI_API_KEY"):
+        services["openai"]["api_key"] = value
+    if value := os.getenv("MATHPIX_APP_ID"):
+        services["mathpix"]["app_id"] = value
+    if value := os.getenv("MATHPIX_APP_KEY"):
+        services["mathpix"]["app_key"] = value
+    if value := os.getenv("ZOTERO_USER_ID"):
+        services["zotero"]["user_id"] = value
+    if value := os.getenv("ZOTERO_API_KEY"):
+        services["zotero"]["api_key"] = value
 
-    config: Dict[str, Any] = copy.deepcopy(DEFAULT_CONFIG)
-
-    for path in _candidate_paths():
-        if path.is_file():
-            data = _load_json(path)
-            if not isinstance(data, Mapping):
-                raise ValueError(f"Konfigurationsdatei {path} enthält kein Objekt.")
-            _deep_update(config, data)  # type: ignore[arg-type]
-
-    for keys, env_key in ENVIRONMENT_OVERRIDES.items():
-        value = os.getenv(env_key)
-        if value:
-            _set_nested(config, keys, value)
 
+def load_config() -> Dict[str, Any]:
+    """Return the merged configuration using defaults, files and environment.
+
+    Exactly one file is merged over the defaults — the first existing
+    candidate in precedence order (see :func:`_candidate_paths`); setting
+    PIPELINE_CONFIG_PATH therefore skips the repo-relative stats
+    entirely. The merge result is cached in a small pickle keyed by the
+    chosen file's (path, mtime) plus a fingerprint of the built-in
+    defaults; environment overrides are reapplied on every call so they
+    always reflect the live process.
+    """
+
+    chosen = _chosen_config_path()
+    cache_key = (
+        str(chosen) if chosen else None,
+        chosen.stat().st_mtime if chosen else None,
+        _DEFAULTS_FINGERPRINT,
+    )
+
+    try:
+        with _PICKLE_CACHE_PATH.open("rb") as handle:
+            stored_key, stored_config = pickle.load(handle)
+        if stored_key == cache_key:
+            _apply_env_overrides(stored_config)
+            return stored_config
+    except Exception:  # corrupt/missing cache: fall back to the slow path
+        pass
+
+    # json round-trip of the precomputed default is a fresh, fully
+    # detached tree like deepcopy, but runs in the C parser instead of
+    # deepcopy's per-object dispatch.
+    config: Dict[str, Any] = json.loads(_DEFAULT_CONFIG_JSON)
+
+    if chosen is not None:
+        data = _load_json(chosen)
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Konfigurationsdatei {chosen} enthält kein Objekt.")
+        _deep_update(config, data)  # type: ignore[arg-type]
+
+    try:
+        _PICKLE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _PICKLE_CACHE_PATH.with_suffix(".tmp")
+        with tmp.open("wb") as handle:
+            # Cached before env overrides so secrets never land on disk.
+            pickle.dump((cache_key, config), handle)
+        tmp.rename(_PICKLE_CACHE_PATH)
+    except OSError:
+        pass
+
+    _apply_env_overrides(config)
     return config
 
 
+@lru_cache(maxsize=32)
 def resolve_path(key: str) -> Path:
-    """Resolve a configured path entry to an absolute :class:`Path`."""
+    """Resolve a configured path entry to an absolute :class:`Path`.
+
+    Cached per key: ``.resolve()`` hits the filesystem, and CFG does not
+    change after module load. Use ``resolve_path.cache_clear()`` if the
+    config is ever reloaded in-process.
+    """
 
     path_value = CFG.get("paths", {}).get(key)
     if not path_value:
@@ -1,18 +1,12 @@
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import io
+"""Backward-compat shim: the real implementation lives in src.core.convert_local.
 
-def extract_text_pymupdf(pdf_path: str) -> str:
-    doc = fitz.open(pdf_path)
-    out = []
-    for p in doc:
-        t = p.get_text("text")
-        if t.strip(): out.append(t)
-    return "\n".join(out)
+This module used to carry its own trimmed copies of the PyMuPDF helpers,
+which meant two bytecode compiles and two diverging implementations.
+Import from :mod:`src.core.convert_local` in new code.
+"""
 
-def ocr_pdf_first_page(pdf_path: str) -> str:
-    doc = fitz.open(pdf_path)
-    pix = doc[0].get_pixmap(dpi=300)
-    img = Image.open(io.BytesIO(pix.tobytes("png")))
-    return pytesseract.image_to_string(img, lang="deu+eng")
+from src.core.convert_local import (  # noqa: F401
+    extract_pdf_metadata,
+    extract_text_pymupdf,
+    ocr_pdf_first_page,
+)
@@ -1,30 +1,35 @@
-"""Core functionality for the PDF knowledge pipeline."""
-
-# Import only basic functions to avoid dependency issues
-try:
-    from .convert_local import extract_text_pymupdf, ocr_pdf_first_page
-    CONVERT_AVAILABLE = True
-except ImportError:
-    CONVERT_AVAILABLE = False
-    extract_text_pymupdf = None
-    ocr_pdf_first_page = None
-
-try:
-    from .indexer import add_document, purge_by_source, chunk
-    INDEXER_AVAILABLE = True
-except ImportError:
-    INDEXER_AVAILABLE = False
-    add_document = None
-    purge_by_source = None
-    chunk = None
-
-# Skip RAG import due to numpy compatibility issues
-# from .rag import ask
-
-__all__ = [
-    'extract_text_pymupdf',
-    'ocr_pdf_first_page', 
-    'add_document',
-    'purge_by_source',
-    'chunk'
-]
\ No newline at end of file
+"""Core functionality for the PDF knowledge pipeline.
+
+Exports resolve lazily (PEP 562): importing the package does not load
+PyMuPDF/pytesseract or the indexer stack until a consumer actually
+touches one of the symbols.
+"""
+
+from importlib import import_module
+
+_LAZY = {
+    'extract_text_pymupdf': 'convert_local',
+    'iter_text_pymupdf': 'convert_local',
+    'extract_text_pymupdf_parallel': 'convert_local',
+    'ocr_pdf_first_page': 'convert_local',
+    'extract_pdf_metadata': 'convert_local',
+    'BatchedIndexer': 'indexer',
+    'add_document': 'indexer',
+    'purge_by_source': 'indexer',
+    'chunk': 'indexer',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    submodule = _LAZY.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
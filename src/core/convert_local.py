@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import io
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ..config import CFG
+
 try:
     import fitz  # PyMuPDF
     import pytesseract
@@ -14,18 +19,115 @@ try:
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
+def iter_text_pymupdf(pdf_path: str):
+    """Yield extracted page texts (with separators) one page at a time.
+
+    Callers that write to disk can pass this straight to
+    ``file.writelines`` so peak memory stays at one page instead of the
+    whole document.
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF (fitz) not available. Install with: pip install PyMuPDF")
+
+    with fitz.open(pdf_path) as doc:
+        first = True
+        for p in doc:
+            t = p.get_text("text")
+            if t.strip():
+                if not first:
+                    yield "\n"
+                yield t
+                first = False
+
+
 def extract_text_pymupdf(pdf_path: str) -> str:
     """Extract text from PDF using PyMuPDF."""
+    return "".join(iter_text_pymupdf(pdf_path))
+
+
+def probe_pdf(pdf_path: str, max_pages: int = 2) -> tuple[str, int]:
+    """Return (sample text of the first pages, total page count).
+
+    One document open serves both answers, so routing code does not
+    re-parse the xref table once for the text probe and again to size
+    the OCR work.
+    """
     if not PYMUPDF_AVAILABLE:
         raise ImportError("PyMuPDF (fitz) not available. Install with: pip install PyMuPDF")
-    
+
+    with fitz.open(pdf_path) as doc:
+        parts = []
+        for page_num in range(min(max_pages, doc.page_count)):
+            t = doc[page_num].get_text("text")
+            if t.strip():
+                parts.append(t)
+        return "\n".join(parts), doc.page_count
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> list[str]:
+    """Extract text for pages [start, stop) — top-level so it pickles."""
     doc = fitz.open(pdf_path)
     out = []
-    for p in doc:
-        t = p.get_text("text")
+    for page_no in range(start, stop):
+        t = doc[page_no].get_text("text")
         if t.strip():
             out.append(t)
-    return "\n".join(out)
+    return out
+
+
+def extract_text_pymupdf_parallel(pdf_path: str, workers: int | None = None) -> str:
+    """Extract text from a large PDF with page ranges fanned out over processes.
+
+    Each worker re-opens the document and walks its own contiguous page
+    range, so nothing but the path and two ints crosses the process
+    boundary. Short documents stay serial: the pool startup costs more
+    than it saves below a few dozen pages.
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF (fitz) not available. Install with: pip install PyMuPDF")
+
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+
+    workers = workers or min(os.cpu_count() or 1, 8)
+    if page_count < 32 or workers < 2:
+        return extract_text_pymupdf(pdf_path)
+
+    step = -(-page_count // workers)  # ceil division
+    ranges = [(i, min(i + step, page_count)) for i in range(0, page_count, step)]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+        parts = ex.map(_extract_pages, *zip(*((pdf_path, a, b) for a, b in ranges)))
+    return "\n".join(t for chunk in parts for t in chunk)
+
+
+def _render_page_tiled(page, dpi: int = 300, tiles: int = 4):
+    """Rasterize ``page`` as horizontal strips rendered in parallel.
+
+    MuPDF drops the GIL inside ``get_pixmap``, so independent ``clip``
+    rectangles of the same page render concurrently on a thread pool —
+    at OCR resolutions the raster step otherwise pegs a single core.
+    The strips are stitched back together with one paste per tile.
+    """
+    matrix = fitz.Matrix(dpi / 72, dpi / 72)
+    if tiles < 2:
+        pix = page.get_pixmap(matrix=matrix)
+        mode = "RGBA" if pix.alpha else "RGB"
+        return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+
+    rect = page.rect
+    ys = [rect.y0 + i * rect.height / tiles for i in range(tiles + 1)]
+    clips = [fitz.Rect(rect.x0, ys[i], rect.x1, ys[i + 1]) for i in range(tiles)]
+    with ThreadPoolExecutor(max_workers=tiles) as ex:
+        pixmaps = list(ex.map(lambda c: page.get_pixmap(matrix=matrix, clip=c), clips))
+
+    mode = "RGBA" if pixmaps[0].alpha else "RGB"
+    width = max(p.width for p in pixmaps)
+    stitched = Image.new(mode, (width, sum(p.height for p in pixmaps)))
+    y = 0
+    for pix in pixmaps:
+        stitched.paste(Image.frombytes(mode, (pix.width, pix.height), pix.samples), (0, y))
+        y += pix.height
+    return stitched
+
 
 def ocr_pdf_first_page(pdf_path: str) -> str:
     """OCR first page of PDF using Tesseract."""
@@ -33,8 +135,7 @@ def ocr_pdf_first_page(pdf_path: str) -> str:
         raise ImportError("PyMuPDF (fitz) or pytesseract not available")
 
     doc = fitz.open(pdf_path)
-    pix = doc[0].get_pixmap(dpi=300)
-    img = Image.open(io.BytesIO(pix.tobytes("png")))
+    img = _render_page_tiled(doc[0], dpi=300)
     return pytesseract.image_to_string(img, lang="deu+eng")
 
 
@@ -55,8 +156,29 @@ def _normalize_pdf_date(value: Optional[str]) -> Optional[str]:
         return value
 
 
+_META_CACHE_DB = Path(CFG.get("paths", {}).get("metadata", "metadata")) / "pdf_meta_cache.sqlite"
+
+
+def _meta_cache_conn() -> Optional[sqlite3.Connection]:
+    try:
+        _META_CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_META_CACHE_DB)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta "
+            "(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, payload TEXT)"
+        )
+        return conn
+    except sqlite3.Error:
+        return None
+
+
 def extract_pdf_metadata(pdf_path: str) -> Dict[str, Any]:
-    """Return structured metadata for ``pdf_path`` using PyMuPDF."""
+    """Return structured metadata for ``pdf_path`` using PyMuPDF.
+
+    Results are cached in a small SQLite table keyed by (path, mtime,
+    size): re-runs over an unchanged library answer from one SELECT plus
+    a stat instead of re-parsing each PDF's xref table.
+    """
 
     if not PYMUPDF_AVAILABLE:
         raise ImportError(
@@ -66,12 +188,21 @@ def extract_pdf_metadata(pdf_path: str) -> Dict[str, Any]:
     pdf = Path(pdf_path)
     stats = pdf.stat()
 
+    conn = _meta_cache_conn()
+    if conn is not None:
+        row = conn.execute(
+            "SELECT mtime, size, payload FROM meta WHERE path = ?", (str(pdf),)
+        ).fetchone()
+        if row and row[0] == stats.st_mtime_ns and row[1] == stats.st_size:
+            conn.close()
+            return json.loads(row[2])
+
     with fitz.open(pdf_path) as doc:
         metadata = doc.metadata or {}
         pages = doc.page_count
         is_encrypted = doc.is_encrypted
 
-    return {
+    result = {
         "title": metadata.get("title") or pdf.stem,
         "author": metadata.get("author"),
         "subject": metadata.get("subject"),
@@ -85,3 +216,16 @@ def extract_pdf_metadata(pdf_path: str) -> Dict[str, Any]:
         "file_size": stats.st_size,
         "absolute_path": str(pdf.resolve()),
     }
+
+    if conn is not None:
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?)",
+                (str(pdf), stats.st_mtime_ns, stats.st_size, json.dumps(result)),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            pass  # caching is best-effort
+        finally:
+            conn.close()
+    return result
@@ -7,9 +7,13 @@ This module implements the intelligent dispatcher described in the hybrid archit
 - Handles the /to_process -> /processed workflow with Zotero integration
 """
 
-import io
+import functools
 import logging
+import os
+import tempfile
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -19,20 +23,44 @@ from enum import Enum
 from ..config import CFG
 
 try:
-    from .zotero_client import ZoteroClient, create_zotero_client
-    from ..pipeline.extract import extract_pdf  # This is the correct function name
+    from .zotero_client import (
+        TAG_ERROR,
+        TAG_PROCESSED,
+        ZoteroClient,
+        create_zotero_client,
+    )
+    from ..pipeline.extract import extract_pdf
+    from .convert_local import probe_pdf
     ZOTERO_AVAILABLE = True
 except ImportError:
     ZoteroClient = None  # type: ignore
     create_zotero_client = None  # type: ignore
     extract_pdf = None  # type: ignore
+    probe_pdf = None  # type: ignore
     ZOTERO_AVAILABLE = False
 
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Constants
 ERROR_NO_ENGINE_AVAILABLE = "No processing engine available"
 
+# Tag-based routing rules: frozen at module scope so the set is built and
+# hashed once, not per dispatcher instance.
+SCIENTIFIC_TAGS = frozenset({
+    '#scientific', '#math_heavy', '#journal_article',
+    '#formulas', '#equations', '#latex', '#research_paper'
+})
+
+# Tags that pre-determine the engine outright — no point probing the PDF
+# for text when the user already marked it as a scan.
+FORCE_OCR_TAGS = frozenset({'#scanned', '#ocr_only'})
+
 
 class ProcessingEngine(Enum):
     """Available PDF processing engines."""
@@ -53,12 +81,99 @@ class ProcessingResult:
     processing_time: float = 0.0
 
 
-@dataclass 
+@dataclass
 class DocumentRoute:
     """Routing decision for a document."""
     engine: ProcessingEngine
     confidence: float
     reason: str
+    # Page count observed during the routing probe; spares the OCR path
+    # a second document open just to size its worker pool.
+    page_count: Optional[int] = None
+
+
+# Engine probes are module-level and memoized: the Tesseract and Nougat
+# checks shell out to subprocesses, which would otherwise be re-paid for
+# every dispatcher constructed (e.g. one per pool worker).
+
+@functools.lru_cache(maxsize=None)
+def _probe_pymupdf() -> bool:
+    import importlib.util
+    return importlib.util.find_spec("fitz") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_tesseract() -> bool:
+    try:
+        import importlib.util
+        if importlib.util.find_spec("pytesseract") is None or importlib.util.find_spec("PIL") is None:
+            return False
+        # Try to get version to ensure it's properly installed
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_nougat() -> bool:
+    try:
+        from ..formulas.nougat_processor import check_nougat_cli
+        return check_nougat_cli()
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_mathpix() -> bool:
+    mathpix_cfg = CFG.get("services", {}).get("mathpix", {})
+    return bool(mathpix_cfg.get("app_key"))
+
+
+# Per-process Tesseract API handle: with tesserocr installed, the
+# language models load once per pool worker instead of once per page
+# (pytesseract forks a fresh tesseract binary for every call).
+_TESS_API = None
+
+
+def _ocr_image(img) -> str:
+    global _TESS_API
+    if TESSEROCR_AVAILABLE:
+        if _TESS_API is None:
+            _TESS_API = tesserocr.PyTessBaseAPI(lang='deu+eng')
+        _TESS_API.SetImage(img)
+        return _TESS_API.GetUTF8Text()
+    import pytesseract
+    return pytesseract.image_to_string(img, lang='deu+eng')
+
+
+def _ocr_page(pdf_path: str, page_num: int) -> Tuple[int, str]:
+    """OCR a single page — top-level so it pickles into pool workers.
+
+    Each worker opens the document itself; only the path and page index
+    cross the process boundary (Tesseract/leptonica are not thread-safe,
+    hence processes rather than threads).
+    """
+    import fitz
+    from PIL import Image
+
+    doc = fitz.open(pdf_path)
+    try:
+        # 200 DPI grayscale: enough resolution for Tesseract's models,
+        # and one byte per pixel instead of three — a third of the data
+        # through its binarization pipeline (the default was 72 DPI RGB).
+        pix = doc[page_num].get_pixmap(
+            matrix=fitz.Matrix(200 / 72, 200 / 72),
+            colorspace=fitz.csGRAY,
+            alpha=False,
+        )
+        # Wrap the raw sample buffer directly — no PPM encode/decode pass
+        # over the multi-MB pixel data.
+        img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        return page_num, _ocr_image(img)
+    finally:
+        doc.close()
 
 
 class PDFDispatcher:
@@ -88,12 +203,17 @@ class PDFDispatcher:
         else:
             self.zotero_client = zotero_client
         
-        # Tag-based routing rules
-        self.scientific_tags = {
-            '#scientific', '#math_heavy', '#journal_article', 
-            '#formulas', '#equations', '#latex', '#research_paper'
-        }
-        
+        # Kept as an attribute alias for backward compatibility.
+        self.scientific_tags = SCIENTIFIC_TAGS
+
+        # One tag-filtered query per tag family, done once up front: the
+        # common case (an item with no routing tag at all) is then a pair
+        # of O(1) set lookups instead of a per-document tag fetch. None
+        # means the bulk query failed; routing falls back to per-item
+        # lookups.
+        self._force_ocr_items = self._prefetch_tagged_keys(FORCE_OCR_TAGS)
+        self._scientific_items = self._prefetch_tagged_keys(SCIENTIFIC_TAGS)
+
         # Processing engine availability
         self.engines_available = {
             ProcessingEngine.PYMUPDF: self._check_pymupdf_available(),
@@ -102,42 +222,54 @@ class PDFDispatcher:
             ProcessingEngine.MATHPIX: self._check_mathpix_available()
         }
         
+        # Engine -> handler table; uniform (pdf_path, start_time, route)
+        # signature keeps dispatch a single dict lookup and lets new
+        # engines register without growing an if/elif chain.
+        self._engine_dispatch = {
+            ProcessingEngine.PYMUPDF: self._process_with_pymupdf,
+            ProcessingEngine.TESSERACT: self._process_with_tesseract,
+            ProcessingEngine.NOUGAT: self._process_with_nougat,
+            ProcessingEngine.MATHPIX: self._process_with_mathpix,
+        }
+
         logger.info(f"📊 Available engines: {[e.value for e, available in self.engines_available.items() if available]}")
     
     def _check_pymupdf_available(self) -> bool:
         """Check if PyMuPDF is available."""
-        try:
-            import importlib.util
-            return importlib.util.find_spec("fitz") is not None
-        except ImportError:
-            return False
-    
+        return _probe_pymupdf()
+
     def _check_tesseract_available(self) -> bool:
         """Check if Tesseract OCR is available."""
-        try:
-            import importlib.util
-            if importlib.util.find_spec("pytesseract") is None or importlib.util.find_spec("PIL") is None:
-                return False
-            # Try to get version to ensure it's properly installed
-            import pytesseract
-            pytesseract.get_tesseract_version()
-            return True
-        except (ImportError, OSError):
-            return False
-    
+        return _probe_tesseract()
+
     def _check_nougat_available(self) -> bool:
         """Check if Nougat CLI-based processing is available."""
-        try:
-            from ..formulas.nougat_processor import check_nougat_cli
-            return check_nougat_cli()
-        except Exception:
-            return False
-    
+        return _probe_nougat()
+
     def _check_mathpix_available(self) -> bool:
         """Check if Mathpix API is configured."""
-        mathpix_cfg = CFG.get("services", {}).get("mathpix", {})
-        return bool(mathpix_cfg.get("app_key"))
-    
+        return _probe_mathpix()
+
+    def _prefetch_tagged_keys(self, tags: frozenset):
+        """Return the frozenset of item keys carrying any of ``tags``."""
+        if self.zotero_client is None:
+            return None
+        try:
+            keys = self.zotero_client.keys_with_any_tag(tags)
+            return frozenset(keys) if keys is not None else None
+        except Exception as e:
+            logger.debug(f"Tag prefetch failed: {e}")
+            return None
+
+    @staticmethod
+    def invalidate_engine_cache() -> None:
+        """Forget memoized probe results (e.g. after installing an engine)."""
+        _probe_pymupdf.cache_clear()
+        _probe_tesseract.cache_clear()
+        _probe_nougat.cache_clear()
+        _probe_mathpix.cache_clear()
+
+
     def analyze_document(self, pdf_path: Path, zotero_item_key: Optional[str] = None) -> DocumentRoute:
         """
         Analyze a document and determine the best processing route.
@@ -150,53 +282,89 @@ class PDFDispatcher:
             DocumentRoute with engine recommendation and reasoning
         """
         
-        # Step 1: Try PyMuPDF first (fastest check)
-        pymupdf_route = self._try_pymupdf_extraction(pdf_path)
+        # Step 1: Authoritative Zotero tags first — the cached tag lookup
+        # is far cheaper than any PDF parse, and a #scanned/#scientific
+        # tag decides the engine without ever probing the file.
+        if zotero_item_key:
+            zotero_route = self._analyze_zotero_tags(zotero_item_key)
+            if zotero_route:
+                return zotero_route
+
+        # Step 2: Try PyMuPDF probe (fastest content-based check)
+        pymupdf_route, page_count = self._try_pymupdf_extraction(pdf_path)
         if pymupdf_route:
             return pymupdf_route
-        
-        # Step 2: Check Zotero tags for routing hints
-        zotero_route = self._analyze_zotero_tags(zotero_item_key)
-        if zotero_route:
-            return zotero_route
-        
+
         # Step 3: Fall back to standard OCR
-        ocr_route = self._get_fallback_route()
-        if ocr_route:
-            return ocr_route
-        
+        route = self._get_fallback_route()
+
         # Step 4: Last resort
-        return self._get_last_resort_route()
+        if route is None:
+            route = self._get_last_resort_route()
+
+        # Whatever engine won, pass along what the probe already learned
+        # so processing does not reopen the file just to count pages.
+        route.page_count = page_count
+        return route
     
-    def _try_pymupdf_extraction(self, pdf_path: Path) -> Optional[DocumentRoute]:
-        """Try PyMuPDF extraction."""
+    def _try_pymupdf_extraction(
+        self, pdf_path: Path
+    ) -> Tuple[Optional[DocumentRoute], Optional[int]]:
+        """Try PyMuPDF extraction.
+
+        Returns the route (if the text probe succeeds) together with the
+        page count the probe observed, so callers can reuse it.
+        """
         if not self.engines_available[ProcessingEngine.PYMUPDF]:
-            return None
-            
+            return None, None
+
         try:
-            if extract_pdf is not None:
-                sample_text = extract_pdf(pdf_path)
+            if probe_pdf is not None:
+                # Constant-cost probe: the first two pages answer the
+                # "is there extractable text?" question; the full parse
+                # happens only when process_document runs.
+                sample_text, page_count = probe_pdf(str(pdf_path))
                 if sample_text and len(sample_text.strip()) > 100:
                     return DocumentRoute(
                         engine=ProcessingEngine.PYMUPDF,
                         confidence=0.95,
-                        reason="Text-based PDF with sufficient extractable content"
-                    )
+                        reason="Text-based PDF with sufficient extractable content",
+                        page_count=page_count,
+                    ), page_count
+                return None, page_count
         except Exception as e:
             logger.debug(f"PyMuPDF extraction failed for {pdf_path}: {e}")
-        return None
+        return None, None
     
     def _analyze_zotero_tags(self, zotero_item_key: Optional[str]) -> Optional[DocumentRoute]:
         """Analyze Zotero tags for routing hints."""
         if not (self.zotero_client and zotero_item_key):
             return None
-            
+
+        # Fast reject via the prefetched key sets: an item that carries
+        # no routing tag (the overwhelming majority) never triggers a
+        # per-item tag lookup. Items that do match still fetch their
+        # exact tags below, so the route reason stays precise.
+        if self._force_ocr_items is not None and self._scientific_items is not None:
+            if (zotero_item_key not in self._force_ocr_items
+                    and zotero_item_key not in self._scientific_items):
+                return None
+
         try:
-            metadata = self.zotero_client.get_item_metadata(zotero_item_key)
-            tags = set(metadata.get('tags', []))
+            # Version-checked cache in the client: unchanged items answer
+            # from SQLite instead of a Zotero round-trip.
+            tags = set(self.zotero_client.get_item_tags(zotero_item_key))
             
-            # Check for scientific content tags
-            if tags.intersection(self.scientific_tags):
+            # isdisjoint answers the boolean question without building
+            # the intersection set.
+            if not tags.isdisjoint(FORCE_OCR_TAGS):
+                if self.engines_available[ProcessingEngine.TESSERACT]:
+                    return DocumentRoute(
+                        engine=ProcessingEngine.TESSERACT,
+                        confidence=0.90,
+                        reason=f"Tagged as scan: {tags & FORCE_OCR_TAGS}"
+                    )
+            if not tags.isdisjoint(SCIENTIFIC_TAGS):
                 return self._get_scientific_route(tags)
                 
         except Exception as e:
@@ -205,19 +373,18 @@ class PDFDispatcher:
     
     def _get_scientific_route(self, tags: set) -> Optional[DocumentRoute]:
         """Get route for scientific documents."""
-        scientific_tags = tags.intersection(self.scientific_tags)
-        
+        # Intersection computed only on the branch that actually reports it.
         if self.engines_available[ProcessingEngine.NOUGAT]:
             return DocumentRoute(
                 engine=ProcessingEngine.NOUGAT,
                 confidence=0.85,
-                reason=f"Scientific document with tags: {scientific_tags}"
+                reason=f"Scientific document with tags: {tags & SCIENTIFIC_TAGS}"
             )
         elif self.engines_available[ProcessingEngine.MATHPIX]:
             return DocumentRoute(
                 engine=ProcessingEngine.MATHPIX,
                 confidence=0.80,
-                reason=f"Scientific document, using cloud API: {scientific_tags}"
+                reason=f"Scientific document, using cloud API: {tags & SCIENTIFIC_TAGS}"
             )
         return None
     
@@ -267,28 +434,23 @@ class PDFDispatcher:
         Returns:
             ProcessingResult with extracted text and metadata
         """
-        import time
-        start_time = time.time()
-        
+        # Monotonic clock: immune to NTP/DST jumps and fine-grained enough
+        # for the sub-second PyMuPDF path.
+        start_time = time.perf_counter()
+
         try:
-            if route.engine == ProcessingEngine.PYMUPDF:
-                return self._process_with_pymupdf(pdf_path, start_time)
-            elif route.engine == ProcessingEngine.TESSERACT:
-                return self._process_with_tesseract(pdf_path, start_time)
-            elif route.engine == ProcessingEngine.NOUGAT:
-                return self._process_with_nougat(pdf_path, start_time)
-            elif route.engine == ProcessingEngine.MATHPIX:
-                return self._process_with_mathpix(pdf_path, start_time)
-            else:
-                return ProcessingResult(
-                    success=False,
-                    text="",
-                    engine_used=route.engine,
-                    metadata={},
-                    error_message=f"Engine {route.engine.value} not implemented",
-                    processing_time=time.time() - start_time
-                )
-                
+            handler = self._engine_dispatch.get(route.engine)
+            if handler is not None:
+                return handler(pdf_path, start_time, route)
+            return ProcessingResult(
+                success=False,
+                text="",
+                engine_used=route.engine,
+                metadata={},
+                error_message=f"Engine {route.engine.value} not implemented",
+                processing_time=time.perf_counter() - start_time
+            )
+
         except Exception as e:
             return ProcessingResult(
                 success=False,
@@ -296,14 +458,15 @@ class PDFDispatcher:
                 engine_used=route.engine,
                 metadata={},
                 error_message=str(e),
-                processing_time=time.time() - start_time
+                processing_time=time.perf_counter() - start_time
             )
     
-    def _process_with_pymupdf(self, pdf_path: Path, start_time: float) -> ProcessingResult:
+    def _process_with_pymupdf(
+        self, pdf_path: Path, start_time: float, route: Optional[DocumentRoute] = None
+    ) -> ProcessingResult:
         """Process with PyMuPDF."""
         if extract_pdf is None:
             raise ImportError("PyMuPDF extraction not available")
-        
         text = extract_pdf(pdf_path)
         
         return ProcessingResult(
@@ -311,45 +474,57 @@ class PDFDispatcher:
             text=text,
             engine_used=ProcessingEngine.PYMUPDF,
             metadata={'pages': 'unknown', 'method': 'text_extraction'},
-            processing_time=time.time() - start_time
+            processing_time=time.perf_counter() - start_time
         )
     
-    def _process_with_tesseract(self, pdf_path: Path, start_time: float) -> ProcessingResult:
-        """Process with Tesseract OCR."""
+    def _process_with_tesseract(
+        self, pdf_path: Path, start_time: float, route: Optional[DocumentRoute] = None
+    ) -> ProcessingResult:
+        """Process with Tesseract OCR.
+
+        Pages are independent CPU-bound work, so they fan out over a
+        process pool; single-page documents skip the pool entirely.
+        """
         try:
-            import pytesseract
-            from PIL import Image
-            import fitz  # PyMuPDF for image extraction
-            
-            # Convert PDF pages to images and OCR
-            doc = fitz.open(pdf_path)
-            full_text = []
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                pix = page.get_pixmap()
-                img_data = pix.tobytes("ppm")
-                
-                # Convert to PIL Image and OCR
-                img = Image.open(io.BytesIO(img_data))
-                page_text = pytesseract.image_to_string(img, lang='deu+eng')
-                full_text.append(page_text)
-            
-            doc.close()
-            text = "\n\n".join(full_text)
+            if route is not None and route.page_count is not None:
+                # Routing already opened the file; don't parse it again
+                # just for the page count.
+                page_count = route.page_count
+            else:
+                import fitz  # PyMuPDF for image extraction
+
+                doc = fitz.open(pdf_path)
+                page_count = len(doc)
+                doc.close()
+
+            full_text: List[Optional[str]] = [None] * page_count
+            if page_count <= 1:
+                for page_num in range(page_count):
+                    _, full_text[page_num] = _ocr_page(str(pdf_path), page_num)
+            else:
+                workers = min(page_count, os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    for page_num, page_text in ex.map(
+                        _ocr_page, [str(pdf_path)] * page_count, range(page_count)
+                    ):
+                        full_text[page_num] = page_text
+
+            text = "\n\n".join(t or "" for t in full_text)
             
             return ProcessingResult(
                 success=bool(text.strip()),
                 text=text,
                 engine_used=ProcessingEngine.TESSERACT,
                 metadata={'pages': len(full_text), 'method': 'ocr'},
-                processing_time=time.time() - start_time
+                processing_time=time.perf_counter() - start_time
             )
             
         except ImportError as e:
             raise ImportError(f"Tesseract dependencies not available: {e}")
     
-    def _process_with_nougat(self, pdf_path: Path, start_time: float) -> ProcessingResult:
+    def _process_with_nougat(
+        self, pdf_path: Path, start_time: float, route: Optional[DocumentRoute] = None
+    ) -> ProcessingResult:
         """Process with Nougat OCR."""
         try:
             from ..formulas.nougat_processor import create_nougat_processor
@@ -362,7 +537,7 @@ class PDFDispatcher:
                     engine_used=ProcessingEngine.NOUGAT,
                     metadata={},
                     error_message="Nougat processor not available",
-                    processing_time=time.time() - start_time
+                    processing_time=time.perf_counter() - start_time
                 )
             
             # Process PDF with Nougat
@@ -374,7 +549,7 @@ class PDFDispatcher:
                     text=result['markdown'],
                     engine_used=ProcessingEngine.NOUGAT,
                     metadata=result.get('metadata', {}),
-                    processing_time=time.time() - start_time
+                    processing_time=time.perf_counter() - start_time
                 )
             else:
                 return ProcessingResult(
@@ -383,7 +558,7 @@ class PDFDispatcher:
                     engine_used=ProcessingEngine.NOUGAT,
                     metadata={},
                     error_message=result.get('error', 'Unknown Nougat error'),
-                    processing_time=time.time() - start_time
+                    processing_time=time.perf_counter() - start_time
                 )
                 
         except ImportError as e:
@@ -393,10 +568,12 @@ class PDFDispatcher:
                 engine_used=ProcessingEngine.NOUGAT,
                 metadata={},
                 error_message=f"Nougat dependencies not available: {e}",
-                processing_time=time.time() - start_time
+                processing_time=time.perf_counter() - start_time
             )
     
-    def _process_with_mathpix(self, pdf_path: Path, start_time: float) -> ProcessingResult:
+    def _process_with_mathpix(
+        self, pdf_path: Path, start_time: float, route: Optional[DocumentRoute] = None
+    ) -> ProcessingResult:
         """Process with Mathpix API (not implemented - use Nougat instead)."""
         _ = pdf_path  # Unused but keep for API consistency
         return ProcessingResult(
@@ -405,7 +582,7 @@ class PDFDispatcher:
             engine_used=ProcessingEngine.MATHPIX,
             metadata={},
             error_message="Mathpix API not implemented - use Nougat instead",
-            processing_time=time.time() - start_time
+            processing_time=time.perf_counter() - start_time
         )
     
     def process_zotero_queue(self, max_items: int = 10) -> List[Tuple[str, ProcessingResult]]:
@@ -421,66 +598,87 @@ class PDFDispatcher:
         if not self.zotero_client:
             logger.error("No Zotero client available")
             return []
-        
-        # Get items to process
-        items = self.zotero_client.get_items_to_process(limit=max_items)
-        if not items:
-            logger.info("No items found with /to_process tag")
-            return []
-        
-        logger.info(f"📋 Processing {len(items)} items from Zotero queue")
+
+        # Items stream in page-by-page: the first download starts after
+        # one small metadata fetch instead of after the full listing.
+        items = self.zotero_client.iter_items_to_process(limit=max_items)
         results = []
-        
-        for item in items:
+
+        # Status tags accumulate until the item stream is exhausted: the
+        # iterator pages over the very /to_process query these updates
+        # shrink, so flushing mid-run would move items underneath its
+        # offset and silently skip them. batch_update_status splits the
+        # single final flush into Zotero's 50-item write requests itself.
+        pending_updates: List[Tuple[str, str, Optional[str]]] = []
+
+        def _mark(item_key: str, status_tag: str, error_message: Optional[str] = None) -> None:
+            pending_updates.append((item_key, status_tag, error_message))
+
+        def _fetch(item: Dict) -> Tuple[str, Optional[Path], Optional[str]]:
+            """Network-bound part of one item: attachment lookup + download."""
             item_key = item['key']
             try:
-                # Get PDF attachments
                 pdfs = self.zotero_client.get_pdf_attachments(item_key)
-                
                 if not pdfs:
-                    logger.warning(f"No PDF attachments found for item {item_key}")
-                    self.zotero_client.mark_as_error(item_key, "No PDF attachments found")
-                    continue
-                
+                    return item_key, None, "No PDF attachments found"
                 # Process first PDF (could be extended for multiple PDFs)
-                pdf_attachment = pdfs[0]
-                
-                # Download PDF to temp location
-                temp_dir = Path("tmp_processing")
-                temp_dir.mkdir(exist_ok=True)
-                
-                pdf_path = self.zotero_client.download_pdf(pdf_attachment['key'], temp_dir)
+                pdf_path = self.zotero_client.download_pdf(pdfs[0]['key'], temp_dir)
                 if not pdf_path:
-                    self.zotero_client.mark_as_error(item_key, "Failed to download PDF")
-                    continue
-                
-                # Analyze and process
+                    return item_key, None, "Failed to download PDF"
+                return item_key, pdf_path, None
+            except Exception as e:  # surfaced as an error mark below
+                return item_key, None, str(e)
+
+        # Downloads run ahead on a small thread pool while the main thread
+        # analyzes/OCRs already-fetched PDFs, so throughput is bounded by
+        # max(network, cpu) instead of their sum. (The CPU-heavy Tesseract
+        # path fans out over its own process pool internally.) One
+        # TemporaryDirectory spans the whole run: no per-item mkdir, and
+        # every download is removed on exit even when processing raises.
+        def _handle(future) -> None:
+            item_key, pdf_path, fetch_error = future.result()
+            if fetch_error:
+                logger.warning(f"⚠️ {item_key}: {fetch_error}")
+                _mark(item_key, TAG_ERROR, fetch_error)
+                return
+
+            try:
                 route = self.analyze_document(pdf_path, item_key)
                 logger.info(f"📄 {pdf_path.name}: {route.reason} -> {route.engine.value}")
-                
+
                 result = self.process_document(pdf_path, route)
-                
+
                 if result.success:
-                    # Mark as processed in Zotero
-                    self.zotero_client.mark_as_processed(item_key)
+                    _mark(item_key, TAG_PROCESSED)
                     logger.info(f"✅ Successfully processed {item_key}")
                 else:
-                    # Mark as error in Zotero
-                    self.zotero_client.mark_as_error(item_key, result.error_message)
+                    _mark(item_key, TAG_ERROR, result.error_message)
                     logger.error(f"❌ Failed to process {item_key}: {result.error_message}")
-                
+
                 results.append((item_key, result))
-                
-                # Clean up temp file
-                try:
-                    pdf_path.unlink()
-                except Exception:
-                    pass
-                
             except Exception as e:
                 logger.error(f"❌ Error processing item {item_key}: {e}")
-                self.zotero_client.mark_as_error(item_key, str(e))
-        
+                _mark(item_key, TAG_ERROR, str(e))
+
+        with tempfile.TemporaryDirectory(prefix="pdf_dispatch_") as tmp, \
+                ThreadPoolExecutor(max_workers=4) as pool:
+            temp_dir = Path(tmp)
+            # Bounded in-flight window: downloads stay a few items ahead
+            # of processing without buffering the whole queue on disk.
+            in_flight: deque = deque()
+            for item in items:
+                in_flight.append(pool.submit(_fetch, item))
+                if len(in_flight) >= 8:
+                    _handle(in_flight.popleft())
+            while in_flight:
+                _handle(in_flight.popleft())
+
+        if not results and not pending_updates:
+            logger.info("No items found with /to_process tag")
+
+        if pending_updates:
+            self.zotero_client.batch_update_status(pending_updates)
+
         return results
 
 
@@ -0,0 +1,88 @@
+"""Content-addressed cache for sentence-transformer embeddings.
+
+Embeddings are a pure function of (model name, text), so duplicate
+inputs — boilerplate headers, re-indexed files, repeated queries — can
+skip the transformer forward pass entirely. Vectors are persisted as
+raw float32 bytes in a small SQLite table keyed by a content digest,
+the same best-effort cache pattern used for PDF metadata and Zotero
+tags elsewhere in the pipeline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+try:
+    from blake3 import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+_CACHE_DB = Path("processed") / "embed_cache.db"
+
+
+def content_key(model_name: str, text: str) -> bytes:
+    """Return the cache digest for embedding ``text`` with ``model_name``.
+
+    blake3 when installed (SIMD tree hashing, much faster than md5/sha
+    on chunk-sized strings), hashlib's blake2b otherwise.
+    """
+    payload = model_name.encode("utf-8") + b"\x00" + text.encode("utf-8")
+    if BLAKE3_AVAILABLE:
+        return blake3(payload).digest()
+    return hashlib.blake2b(payload, digest_size=32).digest()
+
+
+def _conn() -> Optional[sqlite3.Connection]:
+    try:
+        _CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_CACHE_DB)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embed (key BLOB PRIMARY KEY, vec BLOB)"
+        )
+        return conn
+    except sqlite3.Error:
+        return None
+
+
+def get_many(keys: Sequence[bytes]) -> List[Optional[List[float]]]:
+    """Return cached vectors for ``keys``; None marks a miss."""
+    out: List[Optional[List[float]]] = [None] * len(keys)
+    conn = _conn()
+    if conn is None:
+        return out
+    try:
+        for i, key in enumerate(keys):
+            row = conn.execute("SELECT vec FROM embed WHERE key = ?", (key,)).fetchone()
+            if row:
+                out[i] = array("f", row[0]).tolist()
+    except sqlite3.Error:
+        pass  # caching is best-effort
+    finally:
+        conn.close()
+    return out
+
+
+def put_many(keys: Sequence[bytes], vectors: Sequence[Sequence[float]]) -> None:
+    """Persist freshly computed vectors as raw float32 bytes."""
+    conn = _conn()
+    if conn is None:
+        return
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embed VALUES (?, ?)",
+            [(k, array("f", v).tobytes()) for k, v in zip(keys, vectors)],
+        )
+        conn.commit()
+    except sqlite3.Error:
+        pass  # caching is best-effort
+    finally:
+        conn.close()
+
+
+__all__ = ["content_key", "get_many", "put_many"]
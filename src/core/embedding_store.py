@@ -8,10 +8,13 @@ to store and retrieve document chunks based on semantic similarity.
 
 import os
 import logging
+import re
+from bisect import bisect_right
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import hashlib
-import time
+
+from ..config import CFG
 
 try:
     import chromadb
@@ -29,6 +32,19 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     SentenceTransformer = None
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Default configuration
@@ -37,6 +53,31 @@ DEFAULT_CHUNK_SIZE = 1000
 DEFAULT_CHUNK_OVERLAP = 200
 CHROMA_DB_DIR = Path("processed/chroma_db")
 
+# HNSW tuning shared by newly created collections (see rag.hnsw in the
+# config): graph-based ANN keeps query latency logarithmic instead of
+# degrading linearly with collection size. Raise search_ef for recall,
+# lower it for latency; M/construction_ef only apply at creation time.
+_HNSW_CFG = CFG.get("rag", {}).get("hnsw", {})
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": int(_HNSW_CFG.get("M", 32)),
+    "hnsw:construction_ef": int(_HNSW_CFG.get("construction_ef", 200)),
+    "hnsw:search_ef": int(_HNSW_CFG.get("search_ef", 128)),
+}
+
+
+def _content_hash(text: str, length: int = 8) -> str:
+    """Short non-cryptographic content digest for document IDs.
+
+    blake3's SIMD tree hashing is several times faster than md5 on
+    chunk-sized strings; md5 remains as the fallback when the optional
+    dependency is missing.
+    """
+    data = text.encode()
+    if BLAKE3_AVAILABLE:
+        return blake3(data).hexdigest(length=(length + 1) // 2)[:length]
+    return hashlib.md5(data).hexdigest()[:length]
+
 
 class EmbeddingStore:
     """
@@ -109,7 +150,7 @@ class EmbeddingStore:
             self.collection = self.client.create_collection(
                 name=collection_name,
                 embedding_function=self.embedding_function,
-                metadata={"description": "PDF knowledge base embeddings"}
+                metadata={"description": "PDF knowledge base embeddings", **HNSW_METADATA}
             )
             logger.info(f"🆕 Created new collection '{collection_name}'")
     
@@ -154,22 +195,25 @@ class EmbeddingStore:
         
         # Generate IDs if not provided
         if ids is None:
-            ids = []
-            for i, text in enumerate(texts):
-                # Create deterministic ID based on content hash
-                content_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-                timestamp = int(time.time())
-                doc_id = f"doc_{timestamp}_{i}_{content_hash}"
-                ids.append(doc_id)
-        
+            # Pure content-derived IDs: re-ingesting the same text maps
+            # to the same row, so the upsert below becomes an idempotent
+            # update instead of a second HNSW insertion. (The old scheme
+            # mixed in a timestamp, which duplicated every re-ingest.)
+            ids = [f"doc_{_content_hash(text, length=16)}" for text in texts]
+
+        # Same-content entries within one call collapse to one row;
+        # Chroma rejects duplicate IDs inside a single request.
+        seen = set()
+        unique = [i for i, doc_id in enumerate(ids) if not (doc_id in seen or seen.add(doc_id))]
+
         # Add to ChromaDB
         try:
-            self.collection.add(
-                documents=texts,
-                metadatas=metadatas,
-                ids=ids
+            self.collection.upsert(
+                documents=[texts[i] for i in unique],
+                metadatas=[metadatas[i] for i in unique],
+                ids=[ids[i] for i in unique]
             )
-            logger.info(f"✅ Added {len(texts)} documents to collection '{self.collection_name}'")
+            logger.info(f"✅ Upserted {len(unique)} documents to collection '{self.collection_name}'")
             return ids
         except Exception as e:
             logger.error(f"❌ Failed to add documents: {e}")
@@ -345,7 +389,7 @@ class EmbeddingStore:
             self.collection = self.client.create_collection(
                 name=self.collection_name,
                 embedding_function=self.embedding_function,
-                metadata={"description": "PDF knowledge base embeddings"}
+                metadata={"description": "PDF knowledge base embeddings", **HNSW_METADATA}
             )
             logger.info(f"🔄 Reset collection '{self.collection_name}'")
             return True
@@ -370,20 +414,34 @@ def chunk_text(text: str,
     """
     if len(text) <= chunk_size:
         return [text]
-    
+
+    # Every sentence terminator is located once up front — a single
+    # C-level pass over the string — and each chunk window then finds
+    # its boundary with one binary search instead of a per-chunk rfind.
+    # The numpy path scans the raw bytes with SIMD; it only applies to
+    # ASCII text, where byte offsets equal character offsets ('.', '!'
+    # and '?' never occur inside UTF-8 multi-byte sequences, but their
+    # byte positions shift once umlauts appear before them).
+    if NUMPY_AVAILABLE and text.isascii():
+        buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        stops = np.where((buf == 46) | (buf == 33) | (buf == 63))[0]
+    else:
+        stops = [m.start() for m in re.finditer(r"[.!?]", text)]
+
     chunks = []
     start = 0
-    
+
     while start < len(text):
         end = start + chunk_size
-        
+
         # Try to break at sentence boundary
-        if end < len(text):
-            # Look for sentence ending within the last 100 characters
-            sentence_end = text.rfind('.', start, end)
-            if sentence_end > start + chunk_size // 2:
-                end = sentence_end + 1
-        
+        if end < len(text) and len(stops):
+            idx = bisect_right(stops, end - 1) - 1
+            if idx >= 0:
+                sentence_end = int(stops[idx])
+                if sentence_end > start + chunk_size // 2:
+                    end = sentence_end + 1
+
         chunk = text[start:end].strip()
         if chunk:
             chunks.append(chunk)
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import logging
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from itertools import islice
 from typing import Dict, List
 
 from src.config import CFG
+from src.core import embed_cache
 from src.text.chunking import AdaptiveTextChunker
 
 try:
@@ -24,6 +30,8 @@ except ImportError:
     VECTOR_STORE_AVAILABLE = False
 
 
+logger = logging.getLogger(__name__)
+
 RAG_CFG = CFG.get("rag", {})
 PATHS_CFG = CFG.get("paths", {})
 MODELS_CFG = CFG.get("models", {})
@@ -33,6 +41,28 @@ DEFAULT_PERSIST_PATH = RAG_CFG.get("persist_path") or PATHS_CFG.get("chroma", ".
 DEFAULT_EMBEDDING_MODEL = MODELS_CFG.get("embedding", "all-MiniLM-L6-v2")
 
 CHUNK_CFG = RAG_CFG.get("chunking", {})
+ENCODE_BATCH_SIZE = int(RAG_CFG.get("encode_batch", 64))
+QUANTIZE_MODE = str(RAG_CFG.get("quantize", "") or "").lower()
+
+
+def _quantize_vector(vector: List[float]):
+    """Quantize ``vector`` per ``rag.quantize``; returns (stored, scale).
+
+    int8 keeps a per-vector scale (peak/127) so consumers can recover
+    magnitudes; ranking needs no dequantization because cosine is
+    invariant to per-vector scaling. fp16 round-trips through IEEE half
+    precision, halving the information content without changing the
+    value type. Off ("") passes vectors through untouched.
+    """
+
+    if QUANTIZE_MODE == "int8":
+        peak = max((abs(x) for x in vector), default=0.0) or 1.0
+        quantized = [min(127, max(-128, round(x * 127.0 / peak))) for x in vector]
+        return quantized, peak / 127.0
+    if QUANTIZE_MODE == "fp16":
+        packed = struct.pack(f"{len(vector)}e", *vector)
+        return list(struct.unpack(f"{len(vector)}e", packed)), None
+    return vector, None
 
 _CHUNKER = AdaptiveTextChunker(
     base_chunk_size=int(CHUNK_CFG.get("size", 1200)),
@@ -82,48 +112,209 @@ def chunk(text: str, max_chars: int = 1200) -> List[str]:
     return [chunk.text for chunk in _CHUNKER.chunk(text)]
 
 
-def add_document(doc_id: str, text: str, meta: Dict[str, object] | None) -> int:
-    """Add document to the configured ChromaDB collection."""
+UPSERT_BATCH_SIZE = int(CHUNK_CFG.get("upsert_batch_size", 128))
+
+
+class BatchedIndexer:
+    """Accumulate chunks across documents and upsert in fixed-size batches.
+
+    Per-PDF callers would otherwise issue one Chroma transaction per
+    document — tiny writes for short PDFs, oversized ones for books.
+    Buffering and flushing at ``upsert_batch_size`` amortizes Chroma's
+    per-call pickle/SQLite overhead and keeps every batch in the range
+    the Chroma client handles well. Use as a context manager (or call
+    :meth:`close`) so the tail batch is flushed.
+    """
+
+    def __init__(self, batch_size: int = UPSERT_BATCH_SIZE) -> None:
+        self.batch_size = max(1, batch_size)
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, object]] = []
+        self._embeddings: List[List[float]] = []
+        # Encode and upsert don't contend: the torch forward pass and
+        # sqlite writes both drop the GIL, so batch N writes to Chroma
+        # on this single writer thread while the caller encodes N+1.
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._in_flight: deque = deque()
+
+    def add_document(self, doc_id: str, text: str, meta: Dict[str, object] | None = None) -> int:
+        """Chunk, embed and queue one document; returns its chunk count."""
+
+        if not EMBEDDING_AVAILABLE or SentenceTransformer is None or _COLLECTION is None:
+            raise ImportError(
+                "Embedding dependencies not available. Install with: pip install sentence-transformers chromadb"
+            )
+
+        base_meta: Dict[str, object] = dict(meta or {})
+
+        # Counting pass first: the generator holds one chunk at a time,
+        # so learning chunk_count up front costs only string scanning —
+        # far cheaper than embedding — and keeps the metadata exact.
+        total = sum(1 for _ in _CHUNKER.iter_chunks(text))
+        if not total:
+            return 0
+
+        # Second pass streams chunks in encode-sized slices so peak
+        # memory is one slice of chunk strings plus the upsert buffers,
+        # not every chunk of a 50 MB extracted PDF at once.
+        chunk_iter = _CHUNKER.iter_chunks(text)
+        while True:
+            batch = list(islice(chunk_iter, ENCODE_BATCH_SIZE))
+            if not batch:
+                break
+            self._add_chunk_batch(doc_id, batch, base_meta, total)
+        return total
+
+    def _add_chunk_batch(
+        self,
+        doc_id: str,
+        chunks: List,
+        base_meta: Dict[str, object],
+        total: int,
+    ) -> None:
+        """Embed one slice of chunks and append it to the upsert buffers."""
+
+        documents = [chunk.text for chunk in chunks]
+
+        # Content-addressed cache: chunks already embedded with this model
+        # (re-ingested files, boilerplate headers) skip the forward pass.
+        keys = [embed_cache.content_key(DEFAULT_EMBEDDING_MODEL, text) for text in documents]
+        embeddings = embed_cache.get_many(keys)
+        misses = [i for i, vector in enumerate(embeddings) if vector is None]
+        if misses:
+            embedder = _get_embedder(DEFAULT_EMBEDDING_MODEL)
+            # Identical texts among the misses (repeated headers,
+            # footers, reference boilerplate) pass through the encoder
+            # once; their vectors scatter back to every position.
+            uniq: Dict[bytes, int] = {}
+            order: List[int] = []
+            for i in misses:
+                if keys[i] not in uniq:
+                    uniq[keys[i]] = len(order)
+                    order.append(i)
+            if len(order) < len(misses):
+                logger.debug(
+                    "Embedding %s unique of %s chunks for %s",
+                    len(order), len(misses), doc_id,
+                )
+            # Fixed batch size keeps the encoder's matmuls full;
+            # unit-norm vectors make downstream cosine a plain dot
+            # product (and are scale-equivalent under the collection's
+            # cosine metric, so mixed old/new vectors rank identically).
+            encoded = embedder.encode(
+                [documents[i] for i in order],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            ).tolist()
+            for i in misses:
+                embeddings[i] = encoded[uniq[keys[i]]]
+            embed_cache.put_many([keys[i] for i in order], encoded)
+
+        # Storage quantization happens after the cache write so cached
+        # vectors stay full precision regardless of the configured mode.
+        scales: List[object] = [None] * len(chunks)
+        if QUANTIZE_MODE:
+            for i, vector in enumerate(embeddings):
+                embeddings[i], scales[i] = _quantize_vector(vector)
+
+        for position, chunk in enumerate(chunks):
+            chunk_meta: Dict[str, object] = dict(base_meta)
+            chunk_meta.update(
+                {
+                    "chunk_index": chunk.index,
+                    "chunk_count": total,
+                    "chunk_start": chunk.start,
+                    "chunk_end": chunk.end,
+                    "chunk_strategy": _CHUNKER.strategy_name,
+                }
+            )
+            if scales[position] is not None:
+                chunk_meta["embedding_scale"] = scales[position]
+            self._metadatas.append(chunk_meta)
+            # Content digest in the ID (reusing the embed-cache key)
+            # makes re-ingestion idempotent: unchanged chunks upsert
+            # onto their existing rows, changed ones get fresh IDs.
+            self._ids.append(f"{doc_id}:{chunk.index}:{keys[position].hex()[:8]}")
+        self._documents.extend(documents)
+        self._embeddings.extend(embeddings)
+
+        if len(self._ids) >= self.batch_size:
+            self._flush()
+
+    def _flush(self, final: bool = False) -> None:
+        """Upsert buffered chunks in ``batch_size`` slices.
+
+        Full slices are written eagerly; the trailing partial slice is
+        held back until ``final`` so consecutive small documents still
+        coalesce into one write.
+        """
+
+        while len(self._ids) >= self.batch_size or (final and self._ids):
+            n = self.batch_size
+            # At most two batches in flight caps buffered memory; waiting
+            # on the oldest also surfaces any upsert error promptly.
+            if len(self._in_flight) >= 2:
+                self._in_flight.popleft().result()
+            self._in_flight.append(
+                self._writer.submit(
+                    _COLLECTION.upsert,
+                    ids=self._ids[:n],
+                    documents=self._documents[:n],
+                    metadatas=self._metadatas[:n],
+                    embeddings=self._embeddings[:n],
+                )
+            )
+            del self._ids[:n]
+            del self._documents[:n]
+            del self._metadatas[:n]
+            del self._embeddings[:n]
+
+    def close(self) -> None:
+        """Flush the buffered tail batch and wait for pending writes."""
+
+        self._flush(final=True)
+        try:
+            while self._in_flight:
+                self._in_flight.popleft().result()
+        finally:
+            self._writer.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchedIndexer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._writer.shutdown(wait=True)
 
-    if not EMBEDDING_AVAILABLE or SentenceTransformer is None or _COLLECTION is None:
-        raise ImportError(
-            "Embedding dependencies not available. Install with: pip install sentence-transformers chromadb"
-        )
 
-    base_meta: Dict[str, object] = dict(meta or {})
-    chunks = _CHUNKER.chunk(text)
-    if not chunks:
-        return 0
-
-    embedder = _get_embedder(DEFAULT_EMBEDDING_MODEL)
-    documents = [chunk.text for chunk in chunks]
-    embeddings = embedder.encode(documents, convert_to_numpy=True).tolist()
-    total = len(chunks)
-
-    metadatas: List[Dict[str, object]] = []
-    for chunk in chunks:
-        chunk_meta: Dict[str, object] = dict(base_meta)
-        chunk_meta.update(
-            {
-                "chunk_index": chunk.index,
-                "chunk_count": total,
-                "chunk_start": chunk.start,
-                "chunk_end": chunk.end,
-                "chunk_strategy": _CHUNKER.strategy_name,
-            }
-        )
-        metadatas.append(chunk_meta)
+def add_document(doc_id: str, text: str, meta: Dict[str, object] | None) -> int:
+    """Add document to the configured ChromaDB collection."""
 
-    ids = [f"{doc_id}:{chunk.index}" for chunk in chunks]
-    _COLLECTION.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
-    return total
+    with BatchedIndexer() as batcher:
+        return batcher.add_document(doc_id, text, meta)
 
 
 @lru_cache(maxsize=4)
 def _get_embedder(model_name: str) -> SentenceTransformer:
     if SentenceTransformer is None:
         raise ImportError("SentenceTransformer is not available")
-    return SentenceTransformer(model_name)
+    model = SentenceTransformer(model_name)
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            # fp16 on CUDA: half the bandwidth, roughly double the
+            # matmul throughput on tensor cores. CPU stays fp32 — half
+            # precision is emulated there and slower.
+            model.half()
+    except Exception:  # noqa: BLE001 - precision tuning is best-effort
+        pass
+    return model
 
 
-__all__ = ["add_document", "purge_by_source", "chunk"]
+__all__ = ["BatchedIndexer", "add_document", "purge_by_source", "chunk"]
@@ -1,25 +1,108 @@
-import chromadb
+import time
+from functools import lru_cache
+
 from sentence_transformers import SentenceTransformer
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from ..config import CFG
+from ..vector_store import get_collection
+from . import embed_cache
 
-def ask(question: str, k: int = 5):
+
+# Model load (hundreds of MB of torch weights) and the Chroma sqlite open
+# are seconds of work per call — construct once per process, like the
+# indexer's _get_embedder.
+@lru_cache(maxsize=4)
+def _get_model(name: str) -> SentenceTransformer:
+    return SentenceTransformer(name)
+
+
+@lru_cache(maxsize=4)
+def _get_coll(path: str, name: str):
+    # Shared singleton client (WAL-tuned in vector_store): queries here
+    # and indexer writes go through the same connection pool, so reads
+    # proceed while add_document upserts.
+    return get_collection(name, persist_path=path)
+
+
+@lru_cache(maxsize=4)
+def _get_chain(chat_model: str, api_key: str):
+    prompt = ChatPromptTemplate.from_template(
+        "Beantworte die Frage ausschließlich anhand des Kontexts.\n\nKontext:\n{context}\n\nFrage: {q}"
+    )
+    llm = ChatOpenAI(api_key=api_key, model=chat_model, temperature=0)
+    return prompt | llm | StrOutputParser()
+
+
+# How long cached retrieval results stay valid; after this, repeat
+# questions re-query Chroma so newly indexed documents surface.
+_RETRIEVAL_TTL = 300
+
+
+@lru_cache(maxsize=512)
+def _retrieve(question: str, k: int, _bucket: int) -> tuple:
+    """Encode ``question`` and query Chroma; memoized per TTL bucket.
+
+    FAQ-style repeat questions skip the entire retrieval pipeline —
+    encode and vector search — on a hit. ``_bucket`` only exists to age
+    entries out of the cache.
+    """
     embedding_model = CFG.get("models", {}).get("embedding", "all-MiniLM-L6-v2")
-    enc = SentenceTransformer(embedding_model).encode([question], convert_to_numpy=True)[0].tolist()
+    # Repeat questions hit the content-addressed cache and never load
+    # the SentenceTransformer at all.
+    key = embed_cache.content_key(embedding_model, question)
+    enc = embed_cache.get_many([key])[0]
+    if enc is None:
+        enc = _get_model(embedding_model).encode([question], convert_to_numpy=True)[0].tolist()
+        embed_cache.put_many([key], [enc])
     persist_path = CFG.get("rag", {}).get("persist_path") or CFG.get("paths", {}).get("chroma", ".chroma")
     collection_name = CFG.get("rag", {}).get("collection", "papers")
-    coll = chromadb.PersistentClient(path=persist_path).get_or_create_collection(collection_name)
+    coll = _get_coll(persist_path, collection_name)
     res = coll.query(query_embeddings=[enc], n_results=k)
-    ctx = "\n\n".join(res["documents"][0]) if res["documents"] else ""
-    prompt = ChatPromptTemplate.from_template(
-        "Beantworte die Frage ausschließlich anhand des Kontexts.\n\nKontext:\n{context}\n\nFrage: {q}"
-    )
+    return tuple(res["documents"][0]) if res["documents"] else ()
+
+
+def ask(question: str, k: int = 5):
+    docs = _retrieve(question.strip().lower(), k, int(time.time() // _RETRIEVAL_TTL))
+    ctx = "\n\n".join(docs)
+    openai_api_key = CFG.get("services", {}).get("openai", {}).get("api_key")
+    if not openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY fehlt. Bitte in der Konfiguration oder Umgebung setzen.")
+    chat_model = CFG.get("models", {}).get("chat", "gpt-4o-mini")
+    chain = _get_chain(chat_model, openai_api_key)
+    return chain.invoke({"context": ctx, "q": question})
+
+
+def ask_many(questions, k: int = 5):
+    """Answer several questions with one batched pass per stage.
+
+    A single 32-way encode is far cheaper than 32 single encodes,
+    Chroma takes all query vectors in one call, and chain.batch lets
+    LangChain issue the OpenAI requests concurrently.
+    """
+    if not questions:
+        return []
+    embedding_model = CFG.get("models", {}).get("embedding", "all-MiniLM-L6-v2")
+    keys = [embed_cache.content_key(embedding_model, q) for q in questions]
+    encs = embed_cache.get_many(keys)
+    misses = [i for i, vector in enumerate(encs) if vector is None]
+    if misses:
+        encoded = _get_model(embedding_model).encode(
+            [questions[i] for i in misses], batch_size=32, convert_to_numpy=True
+        ).tolist()
+        for i, vector in zip(misses, encoded):
+            encs[i] = vector
+        embed_cache.put_many([keys[i] for i in misses], encoded)
+    persist_path = CFG.get("rag", {}).get("persist_path") or CFG.get("paths", {}).get("chroma", ".chroma")
+    collection_name = CFG.get("rag", {}).get("collection", "papers")
+    coll = _get_coll(persist_path, collection_name)
+    res = coll.query(query_embeddings=encs, n_results=k)
+    docs = res.get("documents") or [[] for _ in questions]
+    contexts = ["\n\n".join(d) for d in docs]
     openai_api_key = CFG.get("services", {}).get("openai", {}).get("api_key")
     if not openai_api_key:
         raise RuntimeError("OPENAI_API_KEY fehlt. Bitte in der Konfiguration oder Umgebung setzen.")
     chat_model = CFG.get("models", {}).get("chat", "gpt-4o-mini")
-    llm = ChatOpenAI(api_key=openai_api_key, model=chat_model, temperature=0)
-    chain = prompt | llm | StrOutputParser()
-    return chain.invoke({"context": ctx, "q": question})
\ No newline at end of file
+    chain = _get_chain(chat_model, openai_api_key)
+    return chain.batch([{"context": c, "q": q} for c, q in zip(contexts, questions)])
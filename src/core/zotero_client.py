@@ -8,7 +8,9 @@ implementing the workflow described in the hybrid architecture document:
 - Extract PDFs and annotations for the pipeline
 """
 
+import json
 import os
+import sqlite3
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
@@ -27,6 +29,9 @@ TAG_TO_PROCESS = '/to_process'
 TAG_PROCESSED = '/processed'
 TAG_ERROR = '/error'
 
+# On-disk tag cache so repeated queue runs don't re-fetch unchanged items.
+TAG_CACHE_DB = Path("tmp_processing") / "zotero_tags.sqlite"
+
 
 class ZoteroClient:
     """
@@ -73,13 +78,98 @@ class ZoteroClient:
             logger.error(f"❌ Failed to connect to Zotero: {e}")
             raise
     
+    def _library_version(self) -> Optional[int]:
+        """Return the library's last-modified version (one cheap API call,
+        cached for the client's lifetime)."""
+        if not hasattr(self, '_cached_library_version'):
+            try:
+                self._cached_library_version = self.zot.last_modified_version()
+            except Exception as e:
+                logger.debug(f"Could not fetch library version: {e}")
+                self._cached_library_version = None
+        return self._cached_library_version
+
+    def _tag_cache_conn(self) -> Optional[sqlite3.Connection]:
+        try:
+            TAG_CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(TAG_CACHE_DB)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tags "
+                "(item_key TEXT PRIMARY KEY, version INTEGER, tags TEXT)"
+            )
+            return conn
+        except sqlite3.Error:
+            return None
+
+    def get_item_tags(self, item_key: str) -> List[str]:
+        """
+        Get the tags of an item, served from cache when nothing changed.
+
+        Tags are persisted in a small SQLite table together with the
+        library version they were fetched at. As long as the library's
+        last-modified version matches, lookups cost a local SELECT
+        instead of a Zotero API round-trip — important for large queues,
+        where per-item refetching counts as API abuse.
+        """
+        version = self._library_version()
+        conn = self._tag_cache_conn() if version is not None else None
+
+        if conn is not None:
+            row = conn.execute(
+                "SELECT version, tags FROM tags WHERE item_key = ?", (item_key,)
+            ).fetchone()
+            if row and row[0] == version:
+                conn.close()
+                return json.loads(row[1])
+
+        tags = self.get_item_metadata(item_key).get('tags', [])
+
+        if conn is not None:
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tags VALUES (?, ?, ?)",
+                    (item_key, version, json.dumps(tags)),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                pass  # caching is best-effort
+            finally:
+                conn.close()
+        return tags
+
+    def keys_with_any_tag(self, tags) -> Optional[set]:
+        """
+        Return the set of item keys carrying at least one of ``tags``.
+
+        Zotero's tag filter treats ``a || b`` as OR, so a single query
+        (in the compact ``format=keys`` representation) answers tag
+        membership for the whole library. Callers can then test items
+        with an O(1) set lookup instead of fetching tags per item.
+
+        Args:
+            tags: Iterable of tag strings, OR-combined.
+
+        Returns:
+            Set of item keys, or None if the query failed.
+        """
+        try:
+            raw = self.zot.everything(
+                self.zot.items(tag=' || '.join(sorted(tags)), format='keys')
+            )
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8')
+            return set(raw.split())
+        except Exception as e:
+            logger.warning(f"Tag-filter query failed for {sorted(tags)}: {e}")
+            return None
+
     def get_items_to_process(self, limit: int = 100) -> List[Dict]:
         """
         Get all items tagged with '/to_process' that need processing.
-        
+
         Args:
             limit: Maximum number of items to retrieve
-            
+
         Returns:
             List of Zotero item dictionaries with '/to_process' tag
         """
@@ -91,6 +181,38 @@ class ZoteroClient:
         except Exception as e:
             logger.error(f"Error fetching items to process: {e}")
             return []
+
+    def iter_items_to_process(self, limit: int = 100, page_size: int = 25):
+        """
+        Yield items tagged with '/to_process' as API pages arrive.
+
+        Unlike get_items_to_process, the first item is available after
+        one small page fetch instead of after the full listing, so a
+        consumer can start downloading/OCR work immediately.
+
+        Args:
+            limit: Maximum number of items to yield
+            page_size: Items per API page request
+
+        Yields:
+            Zotero item dictionaries with '/to_process' tag
+        """
+        fetched = 0
+        while fetched < limit:
+            try:
+                batch = self.zot.items(
+                    tag=TAG_TO_PROCESS,
+                    limit=min(page_size, limit - fetched),
+                    start=fetched,
+                )
+            except Exception as e:
+                logger.error(f"Error fetching items to process: {e}")
+                return
+            if not batch:
+                return
+            for item in batch:
+                yield item
+            fetched += len(batch)
     
     def get_pdf_attachments(self, item_key: str) -> List[Dict]:
         """
@@ -279,6 +401,56 @@ class ZoteroClient:
             logger.error(f"❌ Error marking item {item_key} as error: {e}")
             return False
     
+    def batch_update_status(self, updates: List[tuple]) -> bool:
+        """
+        Apply processed/error status tags to many items in bulk.
+
+        Args:
+            updates: List of (item_key, status_tag, error_message) tuples,
+                where status_tag is TAG_PROCESSED or TAG_ERROR and
+                error_message may be None.
+
+        Returns:
+            True if every batch succeeded, False otherwise.
+
+        The Zotero API accepts up to 50 item writes per request, so this
+        costs ~N/50 round-trips instead of the 2N of per-item mark_as_*
+        calls (one GET + one PATCH each).
+        """
+        if not updates:
+            return True
+
+        by_key = {key: (tag, err) for key, tag, err in updates}
+        keys = list(by_key)
+        ok = True
+
+        for start in range(0, len(keys), 50):
+            chunk = keys[start:start + 50]
+            try:
+                items = self.zot.items(itemKey=','.join(chunk))
+                notes = []
+                for item in items:
+                    status_tag, error_message = by_key[item['key']]
+                    tags = [t for t in item['data'].get('tags', []) if t['tag'] != TAG_TO_PROCESS]
+                    if not any(t['tag'] == status_tag for t in tags):
+                        tags.append({'tag': status_tag})
+                    item['data']['tags'] = tags
+
+                    if error_message:
+                        note = self.zot.item_template('note')
+                        note['parentItem'] = item['key']
+                        note['note'] = f"<p><strong>Processing Error:</strong><br/>{error_message}</p>"
+                        notes.append(note)
+
+                self.zot.update_items(items)
+                if notes:
+                    self.zot.create_items(notes)
+                logger.info(f"✅ Updated status tags for {len(items)} items")
+            except Exception as e:
+                logger.error(f"❌ Batch status update failed for {len(chunk)} items: {e}")
+                ok = False
+        return ok
+
     def get_item_metadata(self, item_key: str) -> Dict:
         """
         Get comprehensive metadata for a Zotero item.
@@ -1,4 +1,4 @@
-from src.convert_local import extract_text_pymupdf, ocr_pdf_first_page
+from src.core.convert_local import extract_text_pymupdf, ocr_pdf_first_page
 from src.indexer import add_document
 
 def is_text_pdf(pdf_path: str):
@@ -16,6 +16,8 @@ import shutil
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from ..config import CFG
+
 logger = logging.getLogger(__name__)
 
 # Model constants
@@ -67,6 +69,13 @@ def _build_cli_command(pdf: Path, output_dir: Path, model_name: Optional[str] =
     if model_name and model_name != NOUGAT_MODEL_SMALL:
         cmd.extend(['--model', model_name])
 
+    # The CLI runs the model in reduced precision (bf16 autocast) by
+    # default, which is ~2x faster and halves memory during generation.
+    # Setting nougat.dtype to "float32" in the config forces full
+    # precision for hardware where bf16 is emulated or results differ.
+    if CFG.get("nougat", {}).get("dtype", "bfloat16") == "float32":
+        cmd.append('--full-precision')
+
     if pages:
         cmd.extend(['--pages', pages])
 
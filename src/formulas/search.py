@@ -4,14 +4,34 @@
 import argparse
 import re
 import sqlite3
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 from src.config import CFG
 
 
 _ROOT = Path(__file__).resolve().parents[2]
 
+_REGEX_META = re.compile(r"[.\\^$*+?()\[\]{}|]")
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def _matcher(pattern: str) -> Callable[[str], object]:
+    """Return a latex -> truthy predicate for the given pattern.
+
+    Plain substrings (no regex metacharacters) bypass the regex engine
+    entirely; real patterns are compiled once per process via lru_cache,
+    so repeated queries skip the compile cost.
+    """
+    if not _REGEX_META.search(pattern):
+        return lambda latex: pattern in latex
+    return _compile(pattern).search
+
 
 def _resolve_db_path() -> Path:
     cfg = CFG.get("formulas", {})
@@ -66,14 +86,14 @@ def search_by_pattern(pattern: str, limit: int = 10) -> list[dict]:
     conn = sqlite3.connect(db_path)
     c = conn.cursor()
 
-    regex = re.compile(pattern)
+    match = _matcher(pattern)
     results = []
 
     c.execute("SELECT hash, latex, doc_id, type, source FROM formulas")
 
     for row in c.fetchall():
         h, latex, doc_id, formula_type, source = row
-        if regex.search(latex):
+        if match(latex):
             results.append({
                 'hash': h,
                 'latex': latex,
@@ -118,8 +138,8 @@ def search_formulas(symbol: str = None, contains: str = None, limit: int = 10) -
         # If we have symbol matches, filter them by pattern
         # Otherwise, search all formulas
         search_hashes = list(hashes) if hashes else None
-        pattern = re.compile(contains)
-        
+        match = _matcher(contains)
+
         if search_hashes:
             # Filter existing hashes by pattern
             for h in search_hashes:
@@ -128,7 +148,7 @@ def search_formulas(symbol: str = None, contains: str = None, limit: int = 10) -
                     (h,),
                 )
                 row = c.fetchone()
-                if row and pattern.search(row[0]):
+                if row and match(row[0]):
                     results.append({
                         'hash': h,
                         'latex': row[0],
@@ -141,7 +161,7 @@ def search_formulas(symbol: str = None, contains: str = None, limit: int = 10) -
             c.execute("SELECT hash, latex, doc_id, type, source FROM formulas")
             for row in c.fetchall():
                 h, latex, doc_id, formula_type, source = row
-                if pattern.search(latex):
+                if match(latex):
                     results.append({
                         'hash': h,
                         'latex': latex,
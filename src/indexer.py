@@ -2,6 +2,6 @@
 
 from __future__ import annotations
 
-from .core.indexer import add_document, chunk, purge_by_source
+from .core.indexer import BatchedIndexer, add_document, chunk, purge_by_source
 
-__all__ = ["add_document", "chunk", "purge_by_source"]
+__all__ = ["BatchedIndexer", "add_document", "chunk", "purge_by_source"]
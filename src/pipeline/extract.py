@@ -12,7 +12,11 @@ from typing import Dict, Iterator, List, Optional
 
 from tqdm import tqdm
 
-from ..core.convert_local import extract_pdf_metadata, extract_text_pymupdf
+from ..core.convert_local import (
+    extract_pdf_metadata,
+    extract_text_pymupdf,
+    probe_pdf,
+)
 from ..config import CFG
 from ..text.chunking import AdaptiveTextChunker
 from .logging_utils import get_pipeline_logger, setup_pipeline_logging
@@ -73,6 +77,18 @@ def extract_pdf(pdf_path: Path) -> str:
     return text if text.strip() else ""
 
 
+def extract_pdf_sample(pdf_path: Path, max_pages: int = 2) -> str:
+    """Return text from the first ``max_pages`` pages only.
+
+    Meant for routing probes that just ask "is there extractable text?" —
+    the lazy page iterator stops after the sampled pages, so the cost is
+    constant regardless of document length.
+    """
+
+    text, _ = probe_pdf(str(pdf_path), max_pages)
+    return text if text.strip() else ""
+
+
 def _metadata_path(pdf_path: Path) -> Path:
     return METADATA_DIR / f"{pdf_path.stem}.json"
 
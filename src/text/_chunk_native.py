@@ -0,0 +1,67 @@
+"""Optional numba-accelerated split-point scan for the adaptive chunker.
+
+The jitted kernel mirrors ``AdaptiveTextChunker._find_split_point``
+byte for byte: it checks the same separators in the same preference
+order ("\\n\\n", "\\n", ". ", ".", " ") and, like ``str.rfind``, only
+considers the *last* occurrence of each separator inside the window.
+It operates on a ``uint8`` view of the text and is therefore only
+valid for ASCII input, where byte offsets equal character offsets;
+callers fall back to the Python path for anything else or when numba
+is not installed.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    def make_buffer(text: str):
+        """Return the uint8 view of an ASCII ``text`` for the kernel."""
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+
+    @njit(cache=True)
+    def find_split_point_native(buf, start, window_end, min_size):  # pragma: no cover - jitted
+        # "\n\n"
+        for i in range(window_end - 2, start - 1, -1):
+            if buf[i] == 10 and buf[i + 1] == 10:
+                if i - start >= min_size:
+                    return i + 2
+                break
+        # "\n"
+        for i in range(window_end - 1, start - 1, -1):
+            if buf[i] == 10:
+                if i - start >= min_size:
+                    return i + 1
+                break
+        # ". "
+        for i in range(window_end - 2, start - 1, -1):
+            if buf[i] == 46 and buf[i + 1] == 32:
+                if i - start >= min_size:
+                    return i + 2
+                break
+        # "."
+        for i in range(window_end - 1, start - 1, -1):
+            if buf[i] == 46:
+                if i - start >= min_size:
+                    return i + 1
+                break
+        # " "
+        for i in range(window_end - 1, start - 1, -1):
+            if buf[i] == 32:
+                if i - start >= min_size:
+                    return i + 1
+                break
+        return window_end
+
+
+__all__ = ["NUMBA_AVAILABLE"] + (
+    ["make_buffer", "find_split_point_native"] if NUMBA_AVAILABLE else []
+)
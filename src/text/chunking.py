@@ -5,6 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
+try:
+    from ._chunk_native import NUMBA_AVAILABLE, find_split_point_native, make_buffer
+except ImportError:  # numba/numpy missing — pure-Python path only
+    NUMBA_AVAILABLE = False
+
 
 @dataclass(frozen=True)
 class Chunk:
@@ -55,21 +60,37 @@ class AdaptiveTextChunker:
     def chunk(self, text: str) -> List[Chunk]:
         """Split ``text`` into overlapping chunks with adaptive sizing."""
 
+        return list(self.iter_chunks(text))
+
+    def iter_chunks(self, text: str):
+        """Yield chunks lazily; only one chunk is materialized at a time.
+
+        Streaming consumers (e.g. batched embedding) can process huge
+        extracted PDFs without holding every chunk string at once.
+        """
+
         normalized = text.replace("\r\n", "\n")
         if not normalized.strip():
-            return []
+            return
 
         chunk_size = self._determine_chunk_size(len(normalized))
         overlap = min(self.chunk_overlap, max(0, chunk_size // 3))
 
+        # ASCII documents get the jitted byte-level boundary scan; byte
+        # offsets equal character offsets there, which stops being true
+        # once umlauts appear, hence the fallback to the string path.
+        buf = make_buffer(normalized) if NUMBA_AVAILABLE and normalized.isascii() else None
+
         start = 0
         index = 0
-        chunks: List[Chunk] = []
         length = len(normalized)
 
         while start < length:
             window_end = min(length, start + chunk_size)
-            split_end = self._find_split_point(normalized, start, window_end)
+            if buf is not None:
+                split_end = int(find_split_point_native(buf, start, window_end, self.min_chunk_size))
+            else:
+                split_end = self._find_split_point(normalized, start, window_end)
             raw_chunk = normalized[start:split_end]
             stripped_chunk = raw_chunk.strip("\n")
             leading_ws = len(raw_chunk) - len(raw_chunk.lstrip("\n"))
@@ -89,7 +110,7 @@ class AdaptiveTextChunker:
                     chunk_start = start + relative_start
                     chunk_end = chunk_start + len(stripped_chunk)
 
-                chunks.append(Chunk(text=stripped_chunk, index=index, start=chunk_start, end=chunk_end))
+                yield Chunk(text=stripped_chunk, index=index, start=chunk_start, end=chunk_end)
                 index += 1
 
             if split_end >= length:
@@ -100,8 +121,6 @@ class AdaptiveTextChunker:
                 next_start = split_end
             start = next_start
 
-        return chunks
-
     # ------------------------------------------------------------------
     def _determine_chunk_size(self, document_length: int) -> int:
         if document_length < self.large_document_threshold:
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import sqlite3
 from functools import lru_cache
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from src.config import CFG
@@ -36,6 +38,30 @@ def _settings_for(path: str, overrides: Optional[Dict[str, Any]] = None) -> Sett
     return Settings(**defaults)
 
 
+def _tune_chroma_sqlite(path: str) -> None:
+    """Switch Chroma's sqlite file to WAL mode, once per process.
+
+    journal_mode=WAL is persistent in the database file, so setting it
+    from a short-lived side connection benefits every connection Chroma
+    opens afterwards: readers proceed while the indexer writes, and
+    commits append to the log instead of rewriting a rollback journal.
+    Per-connection pragmas (synchronous, mmap_size, temp_store) would
+    not survive into Chroma's own connections and are left alone.
+    """
+    db = Path(path) / "chroma.sqlite3"
+    if not db.exists():
+        return
+    try:
+        conn = sqlite3.connect(db)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # tuning is best-effort
+
+
 @lru_cache(maxsize=4)
 def get_client(path: Optional[str] = None) -> chromadb.PersistentClient:
     if not CHROMA_AVAILABLE or chromadb is None:
@@ -45,7 +71,13 @@ def get_client(path: Optional[str] = None) -> chromadb.PersistentClient:
     overrides = rag_cfg.get("chroma_settings", {})
     resolved_path = path or rag_cfg.get("persist_path") or CFG.get("paths", {}).get("chroma", ".chroma")
     settings = _settings_for(resolved_path, overrides)
-    return chromadb.PersistentClient(settings=settings)
+    # Before construction for existing stores (Chroma's pool then opens
+    # in WAL), after it so freshly created stores are stamped for the
+    # next process. lru_cache makes this a one-time init per path.
+    _tune_chroma_sqlite(resolved_path)
+    client = chromadb.PersistentClient(settings=settings)
+    _tune_chroma_sqlite(resolved_path)
+    return client
 
 
 @lru_cache(maxsize=16)
@@ -58,7 +90,17 @@ def get_collection(
     client = get_client(persist_path)
     rag_cfg = CFG.get("rag", {})
     metadata_overrides = rag_cfg.get("collection_metadata", {})
-    combined_metadata: Dict[str, Any] = {"hnsw:space": "cosine"}
+    hnsw_cfg = rag_cfg.get("hnsw", {})
+    # Explicit HNSW parameters instead of Chroma's defaults: query time
+    # stays logarithmic as the collection grows past ~100k vectors. The
+    # graph parameters (M, construction_ef) are baked in at collection
+    # creation; search_ef can be retuned on existing collections.
+    combined_metadata: Dict[str, Any] = {
+        "hnsw:space": "cosine",
+        "hnsw:M": int(hnsw_cfg.get("M", 32)),
+        "hnsw:construction_ef": int(hnsw_cfg.get("construction_ef", 200)),
+        "hnsw:search_ef": int(hnsw_cfg.get("search_ef", 128)),
+    }
     combined_metadata.update(metadata_overrides)
     if metadata:
         combined_metadata.update(metadata)